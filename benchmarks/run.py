@@ -0,0 +1,260 @@
+"""
+Benchmarks of BaseRepository hot paths on SQLite.
+
+Run from the project root::
+
+    uv run python -m benchmarks.run --scales 1000,10000 --output bench.json
+
+Every scenario runs on a fresh database, in memory and/or file-backed. One result is reported per
+database, scenario, scale, BATCH_SIZE and load strategy as JSON, so that outputs of two releases
+can be diffed or loaded into a notebook.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime
+import json
+import platform
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+import sa_repository
+from sa_repository import Instrumentation, OperationStats
+from tests.factories import ArticleFactory
+from tests.models import Article, Base, Comment
+from tests.repositories import ArticleRepository
+
+DATABASES = ('memory', 'file')
+SCALES = (1_000, 10_000)
+BATCH_SIZES = (100, 1_000, 5_000)
+LOAD_STRATEGIES = ('joined', 'selectin', 'subquery')
+
+# get_or_create issues a few statements per call, so lookups are capped independently of the table size
+LOOKUP_LIMIT = 1_000
+# comments are seeded for eager loading scenarios, three per article
+EAGER_LOAD_LIMIT = 100_000
+COMMENTS_PER_ARTICLE = 3
+
+Scenario = Callable[[ArticleRepository, int, str], Callable[[], Any]]
+
+
+def article_dicts(scale: int, offset: int = 0) -> list[dict[str, Any]]:
+    return [{'title': f'Article #{offset + i}', 'group': f'group #{i % 10}'} for i in range(scale)]
+
+
+def seed(repository: ArticleRepository, scale: int, comments_per_article: int = 0) -> None:
+    """Insert scale articles, and optionally comments, bypassing the ORM."""
+
+    keys = repository.insert_batch_from_dicts(article_dicts(scale))
+    if comments_per_article:
+        comments = [
+            {'content': f'Comment #{i}', 'article_id': key} for key in keys for i in range(comments_per_article)
+        ]
+        repository.session.execute(sa.insert(Comment), comments)
+    repository.session.commit()
+    repository.session.expunge_all()
+
+
+def lookups(scale: int) -> list[dict[str, Any]]:
+    """Lookup params of which half match seeded articles and half do not."""
+
+    count = min(scale, LOOKUP_LIMIT)
+    start = scale - count // 2
+    return [{'title': f'Article #{i}'} for i in range(start, start + count)]
+
+
+def create_batch(repository: ArticleRepository, scale: int, load_strategy: str) -> Callable[[], Any]:
+    instances = ArticleFactory.build_batch(scale)
+    return lambda: repository.create_batch(instances)
+
+
+def create_batch_from_dicts(repository: ArticleRepository, scale: int, load_strategy: str) -> Callable[[], Any]:
+    data = article_dicts(scale)
+    return lambda: repository.create_batch_from_dicts(data)
+
+
+def create_batch_from_dicts_bulk(repository: ArticleRepository, scale: int, load_strategy: str) -> Callable[[], Any]:
+    data = article_dicts(scale)
+    return lambda: repository.create_batch_from_dicts(data, bulk=True)
+
+
+def insert_batch_from_dicts(repository: ArticleRepository, scale: int, load_strategy: str) -> Callable[[], Any]:
+    data = article_dicts(scale)
+    return lambda: repository.insert_batch_from_dicts(data)
+
+
+def get_or_create(repository: ArticleRepository, scale: int, load_strategy: str) -> Callable[[], Any]:
+    seed(repository, scale)
+    params = lookups(scale)
+    return lambda: [repository.get_or_create(**item) for item in params]
+
+
+def get_or_create_many(repository: ArticleRepository, scale: int, load_strategy: str) -> Callable[[], Any]:
+    seed(repository, scale)
+    params = lookups(scale)
+    return lambda: repository.get_or_create_many(params)
+
+
+def get(repository: ArticleRepository, scale: int, load_strategy: str) -> Callable[[], Any]:
+    seed(repository, scale)
+    titles = [f'Article #{i}' for i in range(min(scale, LOOKUP_LIMIT))]
+    return lambda: [repository.get(Article.title == title) for title in titles]
+
+
+def get_named(repository: ArticleRepository, scale: int, load_strategy: str) -> Callable[[], Any]:
+    seed(repository, scale)
+    titles = [f'Article #{i}' for i in range(min(scale, LOOKUP_LIMIT))]
+    return lambda: [repository.get_named('by_title', title=title) for title in titles]
+
+
+def find(repository: ArticleRepository, scale: int, load_strategy: str) -> Callable[[], Any]:
+    seed(repository, scale)
+    return lambda: repository.find()
+
+
+def iter_find(repository: ArticleRepository, scale: int, load_strategy: str) -> Callable[[], Any]:
+    seed(repository, scale)
+    return lambda: list(repository.iter_find(expunge=True))
+
+
+def find_with_comments(repository: ArticleRepository, scale: int, load_strategy: str) -> Callable[[], Any]:
+    seed(repository, scale, COMMENTS_PER_ARTICLE)
+    return lambda: repository.find(joined_loads=(Article.comments,), load_strategy=load_strategy)
+
+
+# scenarios benchmarked once per BATCH_SIZE
+BATCH_SCENARIOS: dict[str, Scenario] = {
+    'create_batch': create_batch,
+    'create_batch_from_dicts': create_batch_from_dicts,
+    'create_batch_from_dicts_bulk': create_batch_from_dicts_bulk,
+    'insert_batch_from_dicts': insert_batch_from_dicts,
+    'get_or_create_many': get_or_create_many,
+    'iter_find': iter_find,
+}
+# scenarios not depending on BATCH_SIZE
+SCENARIOS: dict[str, Scenario] = {'get_or_create': get_or_create, 'get': get, 'get_named': get_named, 'find': find}
+# scenarios benchmarked once per load strategy
+LOAD_SCENARIOS: dict[str, Scenario] = {'find_with_comments': find_with_comments}
+
+
+@contextlib.contextmanager
+def database(kind: str) -> Iterator[sa.Engine]:
+    """Yield an engine bound to a fresh, empty SQLite database."""
+
+    with tempfile.TemporaryDirectory() as directory:
+        if kind == 'memory':
+            engine = sa.create_engine('sqlite://', poolclass=sa.StaticPool)
+        else:
+            engine = sa.create_engine(f'sqlite:///{Path(directory) / "bench.db"}')
+        Base.metadata.create_all(engine)
+        try:
+            yield engine
+        finally:
+            engine.dispose()
+
+
+def run_scenario(
+    kind: str, name: str, scenario: Scenario, scale: int, batch_size: int | None, load_strategy: str | None
+) -> dict[str, Any]:
+    stats: list[OperationStats] = []
+    with database(kind) as engine, Session(engine) as session:
+        repository = ArticleRepository(session)
+        if batch_size is not None:
+            repository.BATCH_SIZE = batch_size
+        operation = scenario(repository, scale, load_strategy or 'joined')
+
+        instrumentation = Instrumentation(sink=stats.append)
+        with instrumentation.operation(session, name) as operation_stats:
+            operation_stats.set_rows(operation())
+        session.commit()
+
+    result = stats[0]
+    return {
+        'database': kind,
+        'scenario': name,
+        'scale': scale,
+        'batch_size': batch_size,
+        'load_strategy': load_strategy,
+        'duration': result.duration,
+        'rows': result.rows,
+        'rows_per_second': result.rows / result.duration if result.rows and result.duration else None,
+        'statements': len(result.statements),
+        'savepoints': result.savepoints,
+    }
+
+
+def run(
+    databases: list[str], scales: list[int], batch_sizes: list[int], scenarios: list[str] | None
+) -> Iterator[dict[str, Any]]:
+    def selected(names: dict[str, Scenario]) -> list[tuple[str, Scenario]]:
+        return [(name, scenario) for name, scenario in names.items() if scenarios is None or name in scenarios]
+
+    for kind in databases:
+        for scale in scales:
+            for name, scenario in selected(BATCH_SCENARIOS):
+                for batch_size in batch_sizes:
+                    yield run_scenario(kind, name, scenario, scale, batch_size, None)
+            for name, scenario in selected(SCENARIOS):
+                yield run_scenario(kind, name, scenario, scale, None, None)
+            if scale > EAGER_LOAD_LIMIT:
+                continue
+            for name, scenario in selected(LOAD_SCENARIOS):
+                for load_strategy in LOAD_STRATEGIES:
+                    yield run_scenario(kind, name, scenario, scale, None, load_strategy)
+
+
+def parse_ints(value: str) -> list[int]:
+    return [int(item.replace('_', '')) for item in value.split(',')]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--databases', type=lambda v: v.split(','), default=list(DATABASES), help='memory,file')
+    parser.add_argument('--scales', type=parse_ints, default=list(SCALES), help='e.g. 1000,10000,100000,1000000')
+    parser.add_argument('--batch-sizes', type=parse_ints, default=list(BATCH_SIZES), help='BATCH_SIZE values to sweep')
+    parser.add_argument(
+        '--scenarios',
+        type=lambda v: v.split(','),
+        default=None,
+        help=f'subset of {", ".join([*BATCH_SCENARIOS, *SCENARIOS, *LOAD_SCENARIOS])}',
+    )
+    parser.add_argument('--output', type=Path, default=None, help='write JSON to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    results = []
+    for result in run(args.databases, args.scales, args.batch_sizes, args.scenarios):
+        results.append(result)
+        print(
+            f'{result["database"]:<6} {result["scenario"]:<28} scale={result["scale"]:<8} '
+            f'batch_size={result["batch_size"]!s:<5} load_strategy={result["load_strategy"]!s:<8} '
+            f'{result["duration"]:.4f}s statements={result["statements"]}',
+            file=sys.stderr,
+        )
+
+    report = {
+        'meta': {
+            'sa_repository': sa_repository.__version__,
+            'sqlalchemy': sa.__version__,
+            'sqlite': sqlite3.sqlite_version,
+            'python': platform.python_version(),
+            'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        },
+        'results': results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output is None:
+        print(output)
+    else:
+        args.output.write_text(output + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,26 @@
 __version__ = '2.0.0'
 
 
+from .async_base import AsyncBaseRepository
 from .base import BaseRepository
+from .cache import CacheBackend, CacheStats, LRUCache
+from .instrumentation import Instrumentation, MetricsCollector, OperationStats
+from .loading import LoadReport, RejectedRow
+from .parallel import ParallelLoadReport, parallel_load
+from .sharding import ShardedRepository
 
-__all__ = ['BaseRepository']
+__all__ = [
+    'AsyncBaseRepository',
+    'BaseRepository',
+    'CacheBackend',
+    'CacheStats',
+    'Instrumentation',
+    'LRUCache',
+    'LoadReport',
+    'MetricsCollector',
+    'OperationStats',
+    'ParallelLoadReport',
+    'RejectedRow',
+    'ShardedRepository',
+    'parallel_load',
+]
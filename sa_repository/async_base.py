@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Sequence
+
+import more_itertools
+from sqlalchemy import ColumnElement
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .base import LoadStrategy, T, _Repository
+
+__all__ = ['AsyncBaseRepository']
+
+
+class AsyncBaseRepository(_Repository[T]):
+    """
+    Asyncio counterpart of BaseRepository working on an AsyncSession.
+
+    Subclass the same way as BaseRepository::
+
+        class ArticleRepository(AsyncBaseRepository[Article]):
+            def __init__(self, session: AsyncSession):
+                super().__init__(session, Article)
+
+    Statements are built by the same get_query as the synchronous repository.
+    All write operations are flushed immediately within a savepoint.
+    Exceptions propagate from sqlalchemy.exc.
+    """
+
+    def __init__(self, session: AsyncSession, model_class: type[T]):
+        self.session = session
+        self.model_class = model_class
+
+    async def _flush_obj(self, obj: T) -> None:
+        """Add obj to the session and flush within a savepoint."""
+
+        self.session.add(obj)
+        async with self.session.begin_nested():
+            await self.session.flush()
+
+    async def get_or_create(self, **params: Any) -> tuple[T, bool]:
+        """
+        Fetch a single matching record or create one with the given params.
+
+        :returns: (instance, created) — created is True if a new record was inserted.
+        :raises MultipleResultsFound: if the lookup matches more than one record.
+        :raises IntegrityError: on concurrent insert of the same unique key.
+        """
+
+        try:
+            return await self.get(*self._convert_params_to_model_fields(**params)), False
+        except NoResultFound:
+            return await self.create(**params), True
+
+    # read methods
+    async def get(
+        self,
+        *where: ColumnElement,
+        joins: list[Any] | None = None,
+        joined_loads: tuple[Any, ...] | None = None,
+        load_strategy: LoadStrategy | None = None,
+    ) -> T:
+        """
+        Fetch exactly one record matching the given filters.
+
+        :param where: Column filter expressions (ANDed together).
+        :param joins: See get_query.
+        :param joined_loads: See get_query.
+        :param load_strategy: See get_query.
+
+        :returns: The matched model instance.
+
+        :raises NoResultFound: if no record matches.
+        :raises MultipleResultsFound: if more than one record matches.
+        """
+
+        stmt = self.get_query(*where, joins=joins, joined_loads=joined_loads, load_strategy=load_strategy)
+        return (await self.session.scalars(stmt)).unique().one()
+
+    async def get_or_none(
+        self,
+        *where: ColumnElement,
+        joins: list[Any] | None = None,
+        joined_loads: tuple[Any, ...] | None = None,
+        load_strategy: LoadStrategy | None = None,
+    ) -> T | None:
+        """
+        Fetch one record matching the given filters, or None if not found.
+
+        :param where: Column filter expressions (ANDed together).
+        :param joins: See get_query.
+        :param joined_loads: See get_query.
+        :param load_strategy: See get_query.
+        :returns: The matched model instance, or None.
+        :raises MultipleResultsFound: if more than one record matches.
+        """
+
+        stmt = self.get_query(*where, joins=joins, joined_loads=joined_loads, load_strategy=load_strategy)
+        return (await self.session.scalars(stmt)).unique().one_or_none()
+
+    async def find(
+        self,
+        *where: ColumnElement,
+        joins: list[Any] | None = None,
+        order_by: ColumnElement | None = None,
+        joined_loads: tuple[Any, ...] | None = None,
+        load_strategy: LoadStrategy | None = None,
+    ) -> Sequence[T]:
+        """
+        Fetch all records matching the given filters.
+
+        :param where: Column filter expressions (ANDed together). Omit to return all rows.
+        :param joins: See get_query.
+        :param order_by: See get_query.
+        :param joined_loads: See get_query.
+        :param load_strategy: See get_query.
+        :returns: Sequence of matched model instances (empty if none found).
+        """
+
+        stmt = self.get_query(
+            *where, joins=joins, order_by=order_by, joined_loads=joined_loads, load_strategy=load_strategy
+        )
+        return (await self.session.scalars(stmt)).unique().all()
+
+    async def iter_find(
+        self,
+        *where: ColumnElement,
+        joins: list[Any] | None = None,
+        order_by: ColumnElement | None = None,
+        joined_loads: tuple[Any, ...] | None = None,
+        load_strategy: LoadStrategy | None = None,
+        page_size: int | None = None,
+        expunge: bool = False,
+    ) -> AsyncIterator[T]:
+        """
+        Asynchronously iterate over all records matching the given filters, loading them page by page.
+
+        See BaseRepository.iter_find for the pagination strategy and parameters.
+
+        :returns: Async iterator over matched model instances.
+        """
+
+        pages = self._keyset_pages(
+            *where,
+            joins=joins,
+            order_by=order_by,
+            joined_loads=joined_loads,
+            load_strategy=load_strategy,
+            page_size=page_size,
+        )
+        last_key: tuple[Any, ...] | None = None
+        while True:
+            result = pages.filter(await self.session.stream(pages.query(last_key)))
+            rows = await result.all()
+            for row in rows:
+                yield row[0]
+
+            if expunge:
+                for row in rows:
+                    if row[0] in self.session:
+                        self.session.expunge(row[0])
+
+            last_key = pages.next_key(rows)
+            if last_key is None:
+                return
+
+    # write methods
+    async def create(self, **params: Any) -> T:
+        """
+        Create and flush a new model instance.
+
+        :param params: Column values passed as keyword arguments to MODEL_CLASS.
+        :returns: The newly created and flushed instance.
+        :raises TypeError: if any kwarg is not a valid model attribute.
+        """
+
+        obj = self.model_class(**params)
+        await self._flush_obj(obj)
+        return obj
+
+    async def create_batch(self, instances: list[T]) -> list[T]:
+        """
+        Add and flush a list of pre-constructed model instances.
+
+        All instances are validated and inserted within a single savepoint. If any flush
+        fails the entire batch is rolled back atomically.
+
+        :param instances: List of MODEL_CLASS instances to persist.
+        :returns: The same list of instances.
+        :raises ValueError: if any instance is not of MODEL_CLASS type.
+        """
+
+        self._validate_type(instances)
+
+        async with self.session.begin_nested() as savepoint:
+            try:
+                for chunk in more_itertools.chunked(instances, self.BATCH_SIZE):
+                    self.session.add_all(chunk)
+                    await self.session.flush()
+            except Exception as e:
+                await savepoint.rollback()
+                raise e
+        return instances
+
+    async def create_batch_from_dicts(self, data: list[dict[str, Any]]) -> list[T]:
+        """
+        Create and flush model instances from a list of attribute dicts.
+
+        All creates are performed within a single savepoint. If any insert fails the
+        entire batch is rolled back atomically.
+
+        :param data: List of dicts mapping column names to values.
+        :returns: List of newly created and flushed instances.
+        """
+
+        return await self.create_batch([self.model_class(**item) for item in data])
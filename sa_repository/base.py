@@ -1,43 +1,245 @@
 from __future__ import annotations
 
-from typing import Any, Generic, Sequence, TypeVar, cast
+import collections
+import contextlib
+import itertools
+import json
+import os
+import pickle
+import time
+from typing import IO, Any, Callable, Generic, Iterable, Iterator, Literal, Sequence, TypeVar, cast, overload
 
 import more_itertools
 import sqlalchemy as sa
 from sqlalchemy import ColumnElement
-from sqlalchemy.exc import NoResultFound
-from sqlalchemy.orm import DeclarativeBase, Session, joinedload
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import FrozenResult
+from sqlalchemy.engine.result import result_tuple
+from sqlalchemy.exc import DataError, IntegrityError, MultipleResultsFound, NoResultFound
+from sqlalchemy.ext.asyncio import AsyncResult
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    InstanceState,
+    RelationshipProperty,
+    Session,
+    aliased,
+    joinedload,
+    object_session,
+    raiseload,
+    selectinload,
+    subqueryload,
+)
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.compiler import InsertmanyvaluesSentinelOpts
+from sqlalchemy.sql.util import ClauseAdapter, find_tables
+
+from .cache import CacheBackend, CacheStats
+from .columnar import ColumnarBackend, ColumnBuilder, _resolve_backend
+from .instrumentation import Instrumentation, instrumented
+from .loading import FileFormat, LoadReport, RejectedRow, RowCoercer, _python_type, read_records
+from .metadata import ModelMetadata, model_metadata
 
 __all__ = ['BaseRepository']
 
 T = TypeVar('T', bound=DeclarativeBase)
+R = TypeVar('R', sa.Result, AsyncResult)
+RepositoryT = TypeVar('RepositoryT', bound='_Repository[Any]')
+
+SynchronizeSession = Literal['auto', 'evaluate', 'fetch', False]
+LoadStrategy = Literal['auto', 'joined', 'selectin', 'subquery', 'raise']
+BatchReturning = Literal['instances', 'keys', 'count']
+MissingKeys = Literal['skip', 'none', 'raise']
+Route = Literal['primary', 'replica']
+_NamedShape = Literal['entity', 'column', 'rows']
+
+_LOADERS: dict[str, Callable[[Any], Any]] = {
+    'joined': joinedload,
+    'selectin': selectinload,
+    'subquery': subqueryload,
+    'raise': raiseload,
+}
+
+_UPSERT_INSERTS: dict[str, Callable[..., Any]] = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
 
+_REPOSITORY_CLASSES: dict[tuple[type, type], type] = {}
+_NAMED_STATEMENTS: dict[tuple[type, type, str], tuple[sa.Select, _NamedShape]] = {}
+_NAMED_QUERY_STATS: dict[tuple[type, type], CacheStats] = {}
 
-class BaseRepository(Generic[T]):
+# session.info keys of the tables written in the session's open transaction and of the cache tags to drop when it ends
+_WRITTEN_TABLES = 'sa_repository.written_tables'
+_CACHE_WRITES = 'sa_repository.cache_writes'
+
+
+def _track_writes(session: Session, cache: CacheBackend) -> None:
     """
-    Base repository class providing generic CRUD operations for SQLAlchemy models.
+    Record the tables flushed by session until its transaction ends, and invalidate them in cache then.
 
-    Subclass and set MODEL_CLASS to use::
+    Listeners are added once per session, by the first repository with a CACHE created on it or by
+    the first cached read or write.
+    """
 
-        class ArticleRepository(BaseRepository[Article]):
-            MODEL_CLASS = Article
+    if not sa.event.contains(session, 'after_flush', _record_flushed_tables):
+        sa.event.listen(session, 'after_flush', _record_flushed_tables)
+        sa.event.listen(session, 'after_transaction_end', _end_transaction_writes)
+    session.info.setdefault(_CACHE_WRITES, {}).setdefault(cache, set())
+
+
+def _model_tables(classes: Iterable[type]) -> set[str]:
+    tables: set[str] = set()
+    for model_class in set(classes):
+        tables.update(model_metadata(cast(type[DeclarativeBase], model_class)).tables)
+    return tables
+
+
+def _pending_tables(session: Session) -> set[str]:
+    """Names of the tables of the new, changed and deleted objects that session has not flushed yet."""
+
+    return _model_tables(type(obj) for obj in itertools.chain(session.new, session.dirty, session.deleted))
 
-    All write operations are flushed immediately within a savepoint.
-    Exceptions propagate from sqlalchemy.exc.
+
+def _record_flushed_tables(session: Session, flush_context: Any) -> None:
+    session.info.setdefault(_WRITTEN_TABLES, set()).update(_pending_tables(session))
+
+
+def _end_transaction_writes(session: Session, transaction: Any) -> None:
+    """
+    Forget the writes of a committed or rolled back transaction.
+
+    Cached results of the written tables are dropped again — other sessions may have cached rows
+    that the commit made stale while the transaction was open.
     """
 
+    if transaction.parent is not None:
+        return
+    written = session.info.pop(_WRITTEN_TABLES, set())
+    for cache, tags in session.info.pop(_CACHE_WRITES, {}).items():
+        if tags or written:
+            cache.invalidate(tags | written)
+
+
+def _loader_options_key(stmt: sa.Select) -> str:
+    """
+    Describe the loader options of stmt for result cache keys.
+
+    selectin, subquery and raise loaders do not change the SQL of stmt but do change the state of
+    the loaded instances, so results of statements differing in them only must not be shared.
+    """
+
+    options = []
+    for option in stmt._with_options:
+        context = getattr(option, 'context', None)
+        if context is None:
+            options.append(repr(option))
+            continue
+        options.extend(
+            f'{element.path}:{element.strategy!r}:{sorted(element.local_opts.items())!r}' for element in context
+        )
+    return '\n'.join(options)
+
+
+class _KeysetPages:
+    """Statement and bookkeeping of a keyset-paginated SELECT, shared by sync and async iter_find."""
+
+    def __init__(
+        self,
+        stmt: sa.Select,
+        key_columns: list[ColumnElement],
+        descending: bool,
+        page_size: int,
+        joins: bool,
+        joined_eager: bool,
+        nullable: bool,
+    ):
+        self.key_columns = key_columns
+        self.descending = descending
+        self.page_size = page_size
+        self.joins = joins
+        self.nullable = nullable
+        self.deduplicate = joins or joined_eager
+        self.stmt = stmt if self.deduplicate else stmt.execution_options(yield_per=page_size)
+
+    def _after(self, columns: Sequence[ColumnElement], values: Sequence[Any]) -> ColumnElement[bool]:
+        keys = sa.tuple_(*columns)
+        return keys < tuple(values) if self.descending else keys > tuple(values)
+
+    def query(self, last_key: tuple[Any, ...] | None) -> sa.Select:
+        """
+        Return the statement fetching the page that follows last_key, or the first page if None.
+
+        NULLs of a nullable order_by column sort after all values, or before them when descending,
+        and are paged through by the primary key alone since NULL compares to nothing.
+        """
+
+        if last_key is None:
+            return self.stmt
+        if not self.nullable:
+            return self.stmt.where(self._after(self.key_columns, last_key))
+
+        column, pk_columns = self.key_columns[0], self.key_columns[1:]
+        if last_key[0] is None:
+            after_null = sa.and_(column.is_(None), self._after(pk_columns, last_key[1:]))
+            return self.stmt.where(sa.or_(after_null, column.is_not(None)) if self.descending else after_null)
+        after = self._after(self.key_columns, last_key)
+        return self.stmt.where(after if self.descending else sa.or_(after, column.is_(None)))
+
+    def filter(self, result: R) -> R:
+        """Apply de-duplication of records repeated by joins to a page result."""
+
+        return result.unique() if self.deduplicate else result
+
+    def next_key(self, rows: Sequence[sa.Row]) -> tuple[Any, ...] | None:
+        """Return the key to continue after, or None if rows was the last page."""
+
+        # joins may repeat a record, so only an empty page proves the end when they are used
+        if not rows or (len(rows) < self.page_size and not self.joins):
+            return None
+        return tuple(rows[-1][1:])
+
+
+class _Repository(Generic[T]):
+    """Session-independent query construction shared by BaseRepository and AsyncBaseRepository."""
+
     BATCH_SIZE: int = 1000
+    LOAD_STRATEGY: LoadStrategy = 'joined'
 
-    def __init__(self, session: Session, model_class: type[T]):
-        self.session = session
-        self.model_class = model_class
+    model_class: type[T]
+
+    @classmethod
+    def get_repository_from_model(
+        cls: type[RepositoryT], session: Any, model_class: type[DeclarativeBase]
+    ) -> RepositoryT:
+        """
+        Create a repository of model_class without declaring a repository class.
+
+        The generated subclass of cls is created once per model class and reused, so repositories
+        of the same model share class attributes such as CACHE or INSTRUMENTATION.
+
+        :param session: Session, or AsyncSession for AsyncBaseRepository.
+        :param model_class: Mapped class the repository works on.
+        """
+
+        key = (cls, model_class)
+        repository_class = _REPOSITORY_CLASSES.get(key)
+        if repository_class is None:
+            repository_class = _REPOSITORY_CLASSES.setdefault(
+                key, type(f'{model_class.__name__}Repository', (cls,), {'__module__': cls.__module__})
+            )
+        return repository_class(session, model_class)
+
+    @property
+    def model_metadata(self) -> ModelMetadata:
+        """Precomputed mapper information of MODEL_CLASS."""
+
+        return model_metadata(self.model_class)
 
     def _convert_params_to_model_fields(self, **params: Any) -> list[ColumnElement]:
         """Convert keyword arguments to a list of SQLAlchemy column equality expressions."""
 
+        attribute = self.model_metadata.attribute
         result = []
         for name, value in params.items():
-            field = getattr(self.model_class, name)
+            field = attribute(name)
             result.append(cast(ColumnElement, field == value))
         return result
 
@@ -51,26 +253,49 @@ class BaseRepository(Generic[T]):
         if not all((isinstance(instance, self.model_class) for instance in instances)):
             raise ValueError(f'Not all models are instance of class {self.model_class.__name__}')
 
-    def _flush_obj(self, obj: T) -> None:
-        """Add obj to the session and flush within a savepoint."""
+    def _primary_key_columns(self) -> tuple[ColumnElement, ...]:
+        """Return the primary key columns of MODEL_CLASS's mapped table."""
 
-        self.session.add(obj)
-        with self.session.begin_nested():
-            self.session.flush()
+        return self.model_metadata.primary_key
 
-    def get_or_create(self, **params: Any) -> tuple[T, bool]:
+    def _identity_key(self, obj: T) -> Any:
+        """Return the primary key of a flushed instance — a scalar for single-column keys, a tuple otherwise."""
+
+        identity = sa.inspect(obj).identity
+        if identity is None:
+            return None
+        return identity[0] if len(identity) == 1 else identity
+
+    def _in_clause(self, names: Sequence[str], values: list[tuple[Any, ...]]) -> ColumnElement[bool]:
+        """Build a `(col, ...) IN ((val, ...), ...)` expression, or a plain `col IN (...)` for a single column."""
+
+        fields = [self.model_metadata.attribute(name) for name in names]
+        if len(fields) == 1:
+            return cast(ColumnElement[bool], fields[0].in_([value[0] for value in values]))
+        return sa.tuple_(*fields).in_(values)
+
+    def _lookup_clause(self, names: Sequence[str], values: list[tuple[Any, ...]]) -> ColumnElement[bool]:
         """
-        Fetch a single matching record or create one with the given params.
+        Build an expression matching records whose names columns equal any of values, like _in_clause.
 
-        :returns: (instance, created) — created is True if a new record was inserted.
-        :raises MultipleResultsFound: if the lookup matches more than one record.
-        :raises IntegrityError: on concurrent insert of the same unique key.
+        None values are matched with IS NULL, grouping values by which of their columns are None.
         """
 
-        try:
-            return self.get(*self._convert_params_to_model_fields(**params)), False
-        except NoResultFound:
-            return self.create(**params), True
+        attribute = self.model_metadata.attribute
+        groups = more_itertools.bucket(values, key=lambda value: tuple(item is None for item in value))
+        branches = []
+        for nulls in list(groups):
+            positions = [position for position, is_null in enumerate(nulls) if not is_null]
+            clauses = [attribute(name).is_(None) for name, is_null in zip(names, nulls, strict=True) if is_null]
+            if positions:
+                clauses.append(
+                    self._in_clause(
+                        [names[position] for position in positions],
+                        [tuple(value[position] for position in positions) for value in groups[nulls]],
+                    )
+                )
+            branches.append(sa.and_(*clauses))
+        return sa.or_(*branches)
 
     def get_query(
         self,
@@ -78,6 +303,8 @@ class BaseRepository(Generic[T]):
         joins: list[Any] | None = None,
         order_by: ColumnElement | None = None,
         joined_loads: tuple[Any, ...] | None = None,
+        load_strategy: LoadStrategy | None = None,
+        select: tuple[Any, ...] | None = None,
     ) -> sa.Select:
         """
         Build a SELECT statement without executing it.
@@ -86,13 +313,21 @@ class BaseRepository(Generic[T]):
         :param joins: List of join targets. Each element is either a mapped class/relationship
                       or a (target, condition) tuple passed to Query.join().
         :param select: Tuple of column expressions for column-level projection. When provided
-                       the query returns rows, not model instances — use session.execute() directly.
+                       the query returns rows, not model instances. joined_loads are not allowed.
         :param order_by: A single column expression for ORDER BY.
-        :param joined_loads: Tuple of relationship attributes to eagerly load via JOIN.
+        :param joined_loads: Tuple of relationship attributes to eagerly load.
+        :param load_strategy: How joined_loads are loaded — 'joined' (LEFT OUTER JOIN in the same query),
+                              'selectin' (one extra SELECT ... WHERE IN per relationship), 'subquery',
+                              'raise' (forbid loading them) or 'auto' (selectin for collections, joined
+                              otherwise). Defaults to LOAD_STRATEGY.
         :returns: An unexecuted sa.Select statement.
+        :raises ValueError: if both select and joined_loads are given.
         """
 
-        query = sa.select(self.model_class)
+        if select and joined_loads:
+            raise ValueError('joined_loads cannot be used with select, projected rows have no relationships to load')
+
+        query = sa.select(*select).select_from(self.model_class) if select else self.model_metadata.select
         query = query.where(*where_args)
         if order_by is not None:
             query = query.order_by(order_by)
@@ -102,52 +337,711 @@ class BaseRepository(Generic[T]):
                 query = query.join(*join) if isinstance(join, tuple) else query.join(join)
 
         if joined_loads:
-            query = query.options(*[joinedload(j) for j in joined_loads])
+            query = query.options(*[_LOADERS[name](attr) for name, attr in self._loaders(joined_loads, load_strategy)])
         return query
 
+    def _loaders(self, joined_loads: tuple[Any, ...], load_strategy: LoadStrategy | None) -> list[tuple[str, Any]]:
+        """Resolve the loader strategy name used for every relationship attribute of joined_loads."""
+
+        strategy = load_strategy or self.LOAD_STRATEGY
+        if strategy != 'auto':
+            return [(strategy, attr) for attr in joined_loads]
+        return [('selectin' if attr.property.uselist else 'joined', attr) for attr in joined_loads]
+
+    def _keyset_columns(self, order_by: ColumnElement | None) -> tuple[list[ColumnElement], bool]:
+        """
+        Split order_by into the columns used for keyset pagination and its direction.
+
+        :returns: (columns, descending) — order_by's column followed by the primary key columns
+                  that make the ordering unique.
+        """
+
+        descending = False
+        columns: list[ColumnElement] = []
+        if order_by is not None:
+            if isinstance(order_by, sa.UnaryExpression) and order_by.modifier in (operators.asc_op, operators.desc_op):
+                descending = order_by.modifier is operators.desc_op
+                order_by = order_by.element
+            columns.append(order_by)
+
+        columns.extend(pk for pk in self._primary_key_columns() if not any(pk.compare(c) for c in columns))
+        return columns, descending
+
+    def _keyset_pages(
+        self,
+        *where: ColumnElement,
+        joins: list[Any] | None,
+        order_by: ColumnElement | None,
+        joined_loads: tuple[Any, ...] | None,
+        load_strategy: LoadStrategy | None,
+        page_size: int | None,
+    ) -> _KeysetPages:
+        """Build the keyset pagination state for iter_find. See iter_find for parameters."""
+
+        page_size = page_size or self.BATCH_SIZE
+        key_columns, descending = self._keyset_columns(order_by)
+        nullable = order_by is not None and getattr(key_columns[0], 'nullable', True)
+        stmt = self.get_query(*where, joins=joins, joined_loads=joined_loads, load_strategy=load_strategy).add_columns(
+            *key_columns
+        )
+        # an explicit NULL flag sorts NULLs last (first when descending) on every dialect
+        sort_columns = [sa.case((key_columns[0].is_(None), 1), else_=0), *key_columns] if nullable else key_columns
+        stmt = stmt.order_by(*[column.desc() if descending else column.asc() for column in sort_columns])
+        return _KeysetPages(
+            stmt.limit(page_size),
+            key_columns,
+            descending,
+            page_size,
+            joins=bool(joins),
+            joined_eager=any(name == 'joined' for name, _ in self._loaders(joined_loads or (), load_strategy)),
+            nullable=nullable,
+        )
+
+
+class BaseRepository(_Repository[T]):
+    """
+    Base repository class providing generic CRUD operations for SQLAlchemy models.
+
+    Subclass and set MODEL_CLASS to use::
+
+        class ArticleRepository(BaseRepository[Article]):
+            MODEL_CLASS = Article
+
+    Set INSTRUMENTATION to an Instrumentation to record the statements, savepoints, time and rows
+    of every public method call.
+
+    Set QUERIES to declare named queries executed with find_named and get_named. Each statement is
+    built once per repository class and model class and then reused, so calls only bind parameter values::
+
+        class ArticleRepository(BaseRepository[Article]):
+            QUERIES = {
+                'by_group': lambda repository: repository.get_query(
+                    Article.group == sa.bindparam('group'), joined_loads=(Article.comments,)
+                ),
+            }
+
+        ArticleRepository(session).find_named('by_group', group='python')
+
+    Pass replica sessions to route reads — get, get_or_none, find, count, exists, aggregate,
+    iter_find, find_named, get_named and the get_*_by_pk methods — to read replicas in turn, while
+    writes always use the primary session. After a write, reads stay on the primary until its
+    transaction ends and for STICKY_SECONDS afterwards, so they see the repository's own writes
+    despite replication lag. Override routing for a block of calls with route(). Instances read
+    from a replica belong to the replica session — read instances you are going to modify with
+    route('primary').
+
+    Set CACHE to a CacheBackend to serve get, get_or_none and find from a read-through cache.
+    The cache is shared by every session using the repository class, and cached entries
+    are invalidated by the repository's own write methods only — when they are called and
+    again when their transaction ends. A session with uncommitted writes to a table, made by
+    a repository or flushed, neither reads nor fills cached results of that table. Flushes are
+    tracked once a repository with a CACHE is created on the session, so set CACHE on the class.
+
+    All write operations are flushed immediately within a savepoint, unless they are called
+    within unit_of_work(). Exceptions propagate from sqlalchemy.exc.
+    """
+
+    BATCH_SIZE: int = 1000
+    CACHE: CacheBackend | None = None
+    SYNCHRONIZE_SESSION: SynchronizeSession = 'auto'
+    INSTRUMENTATION: Instrumentation | None = None
+    QUERIES: dict[str, sa.Select | Callable[[Any], sa.Select]] = {}
+    STICKY_SECONDS: float = 1.0
+
+    _instrumented_operation: bool = False
+    _deferred_threshold: int | None = None
+    _deferred_count: int = 0
+
+    def __init__(self, session: Session, model_class: type[T], replicas: Sequence[Session] = ()):
+        self.session = session
+        self.model_class = model_class
+        self.replicas = list(replicas)
+        self._replica_cycle = itertools.count()
+        self._route: Route | None = None
+        self._last_write: float | None = None
+        self._write_transaction: Any = None
+        if self.CACHE is not None:
+            _track_writes(session, self.CACHE)
+
+    def _bulk_returning_strategy(self, chunk: list[dict[str, Any]]) -> str | None:
+        """
+        Pick how rows returned by an executemany INSERT ... RETURNING are matched to input order.
+
+        :returns: 'ordered' if the dialect can batch RETURNING in parameter order, 'sort_by_pk' if
+                  the table has an autoincrement primary key whose values grow with input order
+                  and no dict of chunk sets it explicitly, or None if RETURNING cannot be used and
+                  the unit of work must be used instead.
+        """
+
+        dialect = self.session.get_bind().dialect
+        if not dialect.insert_executemany_returning:
+            return None
+        if dialect.insertmanyvalues_implicit_sentinel & InsertmanyvaluesSentinelOpts.ANY_AUTOINCREMENT:
+            return 'ordered'
+
+        pk_names = self.model_metadata.primary_key_names
+        if self.model_metadata.autoincrement and not any(
+            item.get(name) is not None for item in chunk for name in pk_names
+        ):
+            return 'sort_by_pk'
+        return None
+
+    def _bulk_insert(self, chunk: list[dict[str, Any]], return_instances: bool) -> list[Any]:
+        """
+        Insert a chunk of attribute dicts with a single executemany INSERT statement.
+
+        Uses INSERT ... RETURNING when the dialect supports it. Otherwise falls back to the
+        unit of work so that primary keys can still be collected.
+
+        :returns: List of new instances if return_instances is True, otherwise list of primary keys.
+                  Both are in input order.
+        """
+
+        if not chunk:
+            return []
+
+        strategy = self._bulk_returning_strategy(chunk)
+        if strategy is None:
+            instances = [self.model_class(**item) for item in chunk]
+            self.session.add_all(instances)
+            self.session.flush()
+            return instances if return_instances else [self._identity_key(obj) for obj in instances]
+
+        ordered = strategy == 'ordered'
+        if return_instances:
+            stmt = sa.insert(self.model_class).returning(self.model_class, sort_by_parameter_order=ordered)
+            instances = list(self.session.scalars(stmt, chunk).all())
+            return instances if ordered else sorted(instances, key=self._identity_key)
+
+        pk_columns = self._primary_key_columns()
+        stmt = sa.insert(self.model_class).returning(*pk_columns, sort_by_parameter_order=ordered)
+        keys = [row[0] if len(pk_columns) == 1 else tuple(row) for row in self.session.execute(stmt, chunk)]
+        return keys if ordered else sorted(keys)
+
+    def _get_upsert_insert(self) -> Callable[..., Any] | None:
+        """Return the dialect-specific insert() construct supporting ON CONFLICT, or None if unavailable."""
+
+        return _UPSERT_INSERTS.get(self.session.get_bind().dialect.name)
+
+    def _upsert_chunk(
+        self, chunk: list[dict[str, Any]], conflict_columns: Sequence[str], update_columns: Sequence[str]
+    ) -> list[Any]:
+        """Upsert a chunk with a single INSERT ... ON CONFLICT statement and return the affected primary keys."""
+
+        pk_columns = self._primary_key_columns()
+        insert = cast(Callable[..., Any], self._get_upsert_insert())
+        stmt = insert(self.model_class)
+        if update_columns:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(conflict_columns), set_={name: stmt.excluded[name] for name in update_columns}
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_columns))
+
+        rows = self.session.execute(stmt.returning(*pk_columns), chunk)
+        return [row[0] if len(pk_columns) == 1 else tuple(row) for row in rows]
+
+    def _upsert_chunk_fallback(
+        self, chunk: list[dict[str, Any]], conflict_columns: Sequence[str], update_columns: Sequence[str]
+    ) -> list[Any]:
+        """
+        Upsert a chunk on dialects without ON CONFLICT support.
+
+        Existing rows are fetched with one `(conflict columns) IN (...)` query and updated through
+        the unit of work, missing rows are inserted in bulk.
+        """
+
+        def conflict_key(item: dict[str, Any]) -> tuple[Any, ...]:
+            return tuple(item[name] for name in conflict_columns)
+
+        existing = {
+            tuple(getattr(obj, name) for name in conflict_columns): obj
+            for obj in self.session.scalars(
+                self.get_query(self._in_clause(conflict_columns, [conflict_key(item) for item in chunk]))
+            )
+        }
+
+        keys: list[Any] = []
+        missing: list[dict[str, Any]] = []
+        for item in chunk:
+            obj = existing.get(conflict_key(item))
+            if obj is None:
+                missing.append(item)
+                continue
+            if update_columns:
+                for name in update_columns:
+                    setattr(obj, name, item[name])
+                keys.append(self._identity_key(obj))
+
+        self.session.flush()
+        keys.extend(self._bulk_insert(missing, return_instances=False))
+        return keys
+
+    def _flush_obj(self, obj: T) -> None:
+        """Add obj to the session and flush within a savepoint, or stage it within unit_of_work()."""
+
+        if self._deferred_threshold is not None:
+            self._stage([obj])
+            return
+
+        self.session.add(obj)
+        with self.session.begin_nested():
+            self.session.flush()
+        self._record_write()
+
+    def _stage(self, instances: list[T]) -> None:
+        """Add instances to the session, flushing all staged instances once the unit of work threshold is hit."""
+
+        self.session.add_all(instances)
+        self._deferred_count += len(instances)
+        self._record_write()
+        if self._deferred_count >= cast(int, self._deferred_threshold):
+            self._flush_staged()
+
+    def _flush_staged(self) -> None:
+        """Flush instances staged within unit_of_work()."""
+
+        if self._deferred_count:
+            self.session.flush()
+            self._deferred_count = 0
+            self._record_write()
+
+    @contextlib.contextmanager
+    def unit_of_work(self, flush_threshold: int | None = None) -> Iterator[None]:
+        """
+        Defer flushing of objects created within the block to a single flush at its end.
+
+        create, create_batch and create_batch_from_dicts (without bulk) only add instances to the
+        session, so their primary keys and server defaults are not available until the flush. The
+        whole block runs within one savepoint and is rolled back atomically if it raises or the final
+        flush fails. Queries made within the block autoflush staged instances as usual.
+
+        Usage::
+
+            with repository.unit_of_work():
+                for item in data:
+                    repository.create(**item)
+
+        Nested calls join the outermost unit of work.
+
+        :param flush_threshold: Number of staged instances after which they are flushed early, within
+                                the same savepoint. Defaults to BATCH_SIZE.
+        """
+
+        if self._deferred_threshold is not None:
+            yield
+            return
+
+        self._deferred_threshold = flush_threshold or self.BATCH_SIZE
+        self._deferred_count = 0
+        try:
+            with self.session.begin_nested() as savepoint:
+                try:
+                    yield
+                    self._flush_staged()
+                except Exception as e:
+                    savepoint.rollback()
+                    raise e
+        finally:
+            self._deferred_threshold = None
+            self._deferred_count = 0
+
+    def _execute(
+        self, stmt: sa.Select, params: dict[str, Any] | None = None, session: Session | None = None
+    ) -> sa.Result:
+        """
+        Execute a read statement with optional bind parameter values, serving it from CACHE if configured.
+
+        :param session: Session to execute on. Defaults to the one picked by read routing.
+        """
+
+        session = session or self._read_session()
+        if self.CACHE is None:
+            return session.execute(stmt, params)
+
+        compiled = stmt.compile(dialect=session.get_bind().dialect)
+        statement = compiled.compile_state.statement if compiled.compile_state is not None else stmt
+        tables = find_tables(statement, include_joins=True, include_aliases=True)
+        tags = {table.name for table in tables if isinstance(table, sa.Table)}
+        # uncommitted writes, flushed or about to be autoflushed by this read, must neither be cached
+        # for other sessions nor be hidden by cached rows
+        _track_writes(session, self.CACHE)
+        if not tags.isdisjoint(session.info.get(_WRITTEN_TABLES, ())) or not tags.isdisjoint(_pending_tables(session)):
+            return session.execute(stmt, params)
+
+        # replicas may lag behind the primary, so their results never answer reads routed to the primary
+        target = 'primary' if session is self.session else 'replica'
+        params_key = sorted(compiled.construct_params(params).items())
+        key = f'{target}\n{compiled}\n{params_key!r}\n{_loader_options_key(stmt)}'
+        cached = self.CACHE.get(key)
+        if cached is not None:
+            self.CACHE.stats.hits += 1
+            return self._merge_cached(pickle.loads(cached), session)()
+
+        self.CACHE.stats.misses += 1
+        frozen = session.execute(stmt, params).freeze()
+        self.CACHE.set(key, pickle.dumps(frozen), tags=tags)
+        return frozen()
+
+    def named_query_stats(self) -> CacheStats:
+        """
+        Statement cache counters of QUERIES — hits count calls reusing a built statement, misses count builds.
+
+        Counters are shared by all repositories of the same class and MODEL_CLASS.
+        """
+
+        return _NAMED_QUERY_STATS.setdefault((type(self), self.model_class), CacheStats())
+
+    def _named_statement(self, name: str) -> tuple[sa.Select, _NamedShape]:
+        """
+        Return the statement of a named query, building it on first use.
+
+        :returns: (statement, shape) — shape is 'entity' if the statement selects a single entity,
+                  'column' if it selects a single column and 'rows' otherwise.
+
+        :raises KeyError: if QUERIES has no such query.
+        """
+
+        stats = self.named_query_stats()
+        key = (type(self), self.model_class, name)
+        cached = _NAMED_STATEMENTS.get(key)
+        if cached is not None:
+            stats.hits += 1
+            return cached
+
+        try:
+            query = self.QUERIES[name]
+        except KeyError:
+            raise KeyError(f'{type(self).__name__} has no query named {name!r}') from None
+
+        stmt = query if isinstance(query, sa.Select) else query(self)
+        stats.misses += 1
+        descriptions = stmt.column_descriptions
+        shape: _NamedShape = 'rows'
+        if len(descriptions) == 1:
+            # a mapped class is selected as its entity, a column has a SQL type instead
+            entity = descriptions[0].get('entity') is not None and isinstance(descriptions[0]['type'], type)
+            shape = 'entity' if entity else 'column'
+        return _NAMED_STATEMENTS.setdefault(key, (stmt, shape))
+
+    def _named_result(self, name: str, params: dict[str, Any]) -> sa.Result | sa.ScalarResult:
+        """Execute a named query, de-duplicating entities repeated by joined eager loads."""
+
+        stmt, shape = self._named_statement(name)
+        result = self._execute(stmt, params)
+        if shape == 'entity':
+            return result.scalars().unique()
+        return result.scalars() if shape == 'column' else result
+
+    def _merge_cached(self, frozen: FrozenResult, session: Session) -> FrozenResult:
+        """
+        Attach instances of a cached result to the session.
+
+        Instances already present in the identity map are used as they are, like a regular query
+        without populate_existing would do, so pending changes are never overwritten.
+        """
+
+        def merge(value: Any) -> Any:
+            state = sa.inspect(value, raiseerr=False)
+            if not isinstance(state, InstanceState) or state.key is None:
+                return value
+            existing = session.identity_map.get(state.key)
+            return existing if existing is not None else session.merge(value, load=False)
+
+        keyed_tuple = result_tuple(list(frozen.metadata.keys))
+        return frozen.with_new_rows([keyed_tuple([merge(value) for value in row]) for row in frozen.rewrite_rows()])
+
+    @contextlib.contextmanager
+    def route(self, target: Route) -> Iterator[None]:
+        """
+        Send reads made within the block to the primary session or to a replica, regardless of recent writes.
+
+        Usage::
+
+            with repository.route('primary'):
+                article = repository.get(Article.id == article_id)
+
+        :param target: 'primary' or 'replica'. 'replica' falls back to the primary if there are no replicas.
+        """
+
+        previous, self._route = self._route, target
+        try:
+            yield
+        finally:
+            self._route = previous
+
+    def _read_session(self) -> Session:
+        """Return the session the next read should use."""
+
+        if not self.replicas or self._route == 'primary':
+            return self.session
+
+        if self._route is None and self._last_write is not None:
+            in_write_transaction = self.session.get_transaction() is self._write_transaction
+            if in_write_transaction or time.monotonic() - self._last_write < self.STICKY_SECONDS:
+                return self.session
+
+        return self.replicas[next(self._replica_cycle) % len(self.replicas)]
+
+    def _sessions(self) -> list[Session]:
+        """Return the primary session followed by the replica sessions."""
+
+        return [self.session, *self.replicas]
+
+    def _record_write(self) -> None:
+        """
+        Invalidate cached results and keep reads on the primary session after a write.
+
+        The written tables bypass the cache in this session until its transaction ends, and their
+        cached results are invalidated again then.
+        """
+
+        self.invalidate_cache()
+        if self.CACHE is not None:
+            tags = self._cache_tags()
+            _track_writes(self.session, self.CACHE)
+            self.session.info.setdefault(_WRITTEN_TABLES, set()).update(tags)
+            self.session.info[_CACHE_WRITES][self.CACHE].update(tags)
+        self._write_transaction = self.session.get_transaction()
+        self._last_write = time.monotonic()
+
+    def _cache_tags(self) -> frozenset[str]:
+        """Names of the tables written by MODEL_CLASS — its own tables and its relationships' secondaries."""
+
+        return self.model_metadata.tables
+
+    def invalidate_cache(self) -> None:
+        """
+        Drop all cached results reading from MODEL_CLASS's tables.
+
+        Called automatically by every write method. Call it yourself after changing rows in other ways.
+        """
+
+        if self.CACHE is not None:
+            self.CACHE.invalidate(self._cache_tags())
+
+    @instrumented
+    def get_or_create(self, **params: Any) -> tuple[T, bool]:
+        """
+        Fetch a single matching record or create one with the given params.
+
+        :returns: (instance, created) — created is True if a new record was inserted.
+        :raises MultipleResultsFound: if the lookup matches more than one record.
+        :raises IntegrityError: on concurrent insert of the same unique key.
+        """
+
+        try:
+            with self.route('primary'):
+                return self.get(*self._convert_params_to_model_fields(**params)), False
+        except NoResultFound:
+            return self.create(**params), True
+
+    @instrumented
+    def get_or_create_many(self, params: list[dict[str, Any]]) -> list[tuple[T, bool]]:
+        """
+        Fetch or create a record for each of the given param dicts.
+
+        Existing records are resolved with one `(cols) IN (...)` query per BATCH_SIZE chunk and the
+        missing ones are inserted in bulk within a single savepoint. Dicts may only contain column
+        attributes. Repeated params resolve to the same instance, reported as created only once.
+        None values match NULL columns, as in get_or_create.
+
+        :param params: List of dicts mapping column names to values.
+        :returns: (instance, created) pairs in input order.
+        :raises MultipleResultsFound: if any lookup matches more than one record.
+        :raises IntegrityError: on concurrent insert of the same unique key.
+        """
+
+        results: list[tuple[T, bool]] = [cast(tuple[T, bool], None)] * len(params)
+        groups = more_itertools.bucket(range(len(params)), key=lambda index: tuple(sorted(params[index])))
+
+        with self.session.begin_nested() as savepoint:
+            try:
+                for names in list(groups):
+                    for chunk in more_itertools.chunked(groups[names], self.BATCH_SIZE):
+                        self._get_or_create_chunk(params, chunk, names, results)
+            except Exception as e:
+                savepoint.rollback()
+                raise e
+        self._record_write()
+        return results
+
+    def _get_or_create_chunk(
+        self, params: list[dict[str, Any]], indexes: list[int], names: tuple[str, ...], results: list[tuple[T, bool]]
+    ) -> None:
+        """Resolve params[index] for every index in a chunk sharing the same names and store them in results."""
+
+        def lookup_key(item: dict[str, Any]) -> tuple[Any, ...]:
+            return tuple(item[name] for name in names)
+
+        def instance_key(obj: T) -> tuple[Any, ...]:
+            return tuple(getattr(obj, name) for name in names)
+
+        to_create = {lookup_key(params[index]): params[index] for index in indexes}
+        existing: dict[tuple[Any, ...], T] = {}
+        for obj in self.session.scalars(self.get_query(self._lookup_clause(names, list(to_create)))):
+            key = instance_key(obj)
+            if key in existing:
+                raise MultipleResultsFound('Multiple rows were found when one or none was required')
+            existing[key] = obj
+            to_create.pop(key, None)
+
+        # match by the looked up values, the order of bulk inserted instances is not guaranteed
+        created = {instance_key(obj): obj for obj in self._bulk_insert(list(to_create.values()), return_instances=True)}
+        for index in indexes:
+            key = lookup_key(params[index])
+            if key in created:
+                results[index] = created.pop(key), True
+                existing[key] = results[index][0]
+            else:
+                results[index] = existing[key], False
+
     # read methods
+    @overload
+    def get(
+        self,
+        *where: ColumnElement,
+        joins: list[Any] | None = None,
+        joined_loads: tuple[Any, ...] | None = None,
+        load_strategy: LoadStrategy | None = None,
+        select: None = None,
+        row_type: None = None,
+    ) -> T: ...
+
+    @overload
     def get(
-        self, *where: ColumnElement, joins: list[Any] | None = None, joined_loads: tuple[Any, ...] | None = None
-    ) -> T:
+        self,
+        *where: ColumnElement,
+        joins: list[Any] | None = None,
+        joined_loads: tuple[Any, ...] | None = None,
+        load_strategy: LoadStrategy | None = None,
+        select: tuple[Any, ...],
+        row_type: Callable[..., Any] | None = None,
+    ) -> Any: ...
+
+    @instrumented
+    def get(
+        self,
+        *where: ColumnElement,
+        joins: list[Any] | None = None,
+        joined_loads: tuple[Any, ...] | None = None,
+        load_strategy: LoadStrategy | None = None,
+        select: tuple[Any, ...] | None = None,
+        row_type: Callable[..., Any] | None = None,
+    ) -> Any:
         """
         Fetch exactly one record matching the given filters.
 
         :param where: Column filter expressions (ANDed together).
         :param joins: See get_query.
         :param joined_loads: See get_query.
+        :param load_strategy: See get_query.
+        :param select: See get_query.
+        :param row_type: Type projected rows are converted to. None keeps the plain Row tuple, dict
+                         returns a dict keyed by column names and any other callable — e.g. a dataclass
+                         or a class with __slots__ — is called with the columns as keyword arguments.
 
-        :returns: The matched model instance.
+        :returns: The matched model instance, or the projected row if select is given.
 
         :raises NoResultFound: if no record matches.
         :raises MultipleResultsFound: if more than one record matches.
         """
 
-        stmt = self.get_query(*where, joins=joins, joined_loads=joined_loads)
-        return self.session.scalars(stmt).unique().one()
+        stmt = self.get_query(
+            *where, joins=joins, joined_loads=joined_loads, load_strategy=load_strategy, select=select
+        )
+        if select:
+            return self._convert_row(self._execute(stmt).one(), row_type)
+        return self._execute(stmt).scalars().unique().one()
 
+    @overload
     def get_or_none(
-        self, *where: ColumnElement, joins: list[Any] | None = None, joined_loads: tuple[Any, ...] | None = None
-    ) -> T | None:
+        self,
+        *where: ColumnElement,
+        joins: list[Any] | None = None,
+        joined_loads: tuple[Any, ...] | None = None,
+        load_strategy: LoadStrategy | None = None,
+        select: None = None,
+        row_type: None = None,
+    ) -> T | None: ...
+
+    @overload
+    def get_or_none(
+        self,
+        *where: ColumnElement,
+        joins: list[Any] | None = None,
+        joined_loads: tuple[Any, ...] | None = None,
+        load_strategy: LoadStrategy | None = None,
+        select: tuple[Any, ...],
+        row_type: Callable[..., Any] | None = None,
+    ) -> Any: ...
+
+    @instrumented
+    def get_or_none(
+        self,
+        *where: ColumnElement,
+        joins: list[Any] | None = None,
+        joined_loads: tuple[Any, ...] | None = None,
+        load_strategy: LoadStrategy | None = None,
+        select: tuple[Any, ...] | None = None,
+        row_type: Callable[..., Any] | None = None,
+    ) -> Any:
         """
         Fetch one record matching the given filters, or None if not found.
 
         :param where: Column filter expressions (ANDed together).
         :param joins: See get_query.
         :param joined_loads: See get_query.
-        :returns: The matched model instance, or None.
+        :param load_strategy: See get_query.
+        :param select: See get_query.
+        :param row_type: See get.
+        :returns: The matched model instance or projected row, or None.
         :raises MultipleResultsFound: if more than one record matches.
         """
 
-        stmt = self.get_query(*where, joins=joins, joined_loads=joined_loads)
-        return self.session.scalars(stmt).unique().one_or_none()
+        stmt = self.get_query(
+            *where, joins=joins, joined_loads=joined_loads, load_strategy=load_strategy, select=select
+        )
+        if select:
+            row = self._execute(stmt).one_or_none()
+            return None if row is None else self._convert_row(row, row_type)
+        return self._execute(stmt).scalars().unique().one_or_none()
+
+    @overload
+    def find(
+        self,
+        *where: ColumnElement,
+        joins: list[Any] | None = None,
+        order_by: ColumnElement | None = None,
+        joined_loads: tuple[Any, ...] | None = None,
+        load_strategy: LoadStrategy | None = None,
+        select: None = None,
+        row_type: None = None,
+    ) -> Sequence[T]: ...
+
+    @overload
+    def find(
+        self,
+        *where: ColumnElement,
+        joins: list[Any] | None = None,
+        order_by: ColumnElement | None = None,
+        joined_loads: tuple[Any, ...] | None = None,
+        load_strategy: LoadStrategy | None = None,
+        select: tuple[Any, ...],
+        row_type: Callable[..., Any] | None = None,
+    ) -> Sequence[Any]: ...
 
+    @instrumented
     def find(
         self,
         *where: ColumnElement,
         joins: list[Any] | None = None,
         order_by: ColumnElement | None = None,
         joined_loads: tuple[Any, ...] | None = None,
-    ) -> Sequence[T]:
+        load_strategy: LoadStrategy | None = None,
+        select: tuple[Any, ...] | None = None,
+        row_type: Callable[..., Any] | None = None,
+    ) -> Sequence[Any]:
         """
         Fetch all records matching the given filters.
 
@@ -155,16 +1049,377 @@ class BaseRepository(Generic[T]):
         :param joins: See get_query.
         :param order_by: See get_query.
         :param joined_loads: See get_query.
-        :returns: Sequence of matched model instances (empty if none found).
+        :param load_strategy: See get_query.
+        :param select: See get_query.
+        :param row_type: See get.
+        :returns: Sequence of matched model instances or projected rows (empty if none found).
+        """
+
+        stmt = self.get_query(
+            *where,
+            joins=joins,
+            order_by=order_by,
+            joined_loads=joined_loads,
+            load_strategy=load_strategy,
+            select=select,
+        )
+        if select:
+            rows = self._execute(stmt).all()
+            return rows if row_type is None else [self._convert_row(row, row_type) for row in rows]
+        return self._execute(stmt).scalars().unique().all()
+
+    @instrumented
+    def get_by_pk(
+        self, pk: Any, *, joined_loads: tuple[Any, ...] | None = None, load_strategy: LoadStrategy | None = None
+    ) -> T | None:
+        """
+        Fetch a record by primary key with Session.get semantics.
+
+        An instance already present in the session's identity map is returned without querying the database.
+
+        :param pk: Primary key value — a tuple for composite keys.
+        :param joined_loads: See get_query.
+        :param load_strategy: See get_query.
+        :returns: The model instance, or None if not found.
+        """
+
+        options = [_LOADERS[name](attr) for name, attr in self._loaders(joined_loads or (), load_strategy)]
+        return self._read_session().get(self.model_class, pk, options=options)
+
+    @instrumented
+    def get_many_by_pk(
+        self,
+        pks: Iterable[Any],
+        *,
+        missing: MissingKeys = 'skip',
+        joined_loads: tuple[Any, ...] | None = None,
+        load_strategy: LoadStrategy | None = None,
+    ) -> list[Any]:
+        """
+        Fetch records by primary key, in input order.
+
+        Instances already present in the session's identity map are used as they are. The remaining keys
+        are loaded with one `pk IN (...)` query per BATCH_SIZE keys.
+
+        :param pks: Primary key values — tuples for composite keys. Duplicates are allowed.
+        :param missing: What to do with keys not matching any record — 'skip' them, return 'none' in
+                        their place, or 'raise' NoResultFound listing all of them.
+        :param joined_loads: See get_query. Applied to records loaded from the database only.
+        :param load_strategy: See get_query.
+        :returns: List of model instances (and None for missing keys if missing is 'none').
+        :raises NoResultFound: if missing is 'raise' and any key does not match a record.
+        """
+
+        keys = list(pks)
+        found: dict[Any, T] = {}
+        to_load: list[Any] = []
+        session = self._read_session()
+        for key in dict.fromkeys(keys):
+            obj = session.identity_map.get(session.identity_key(self.model_class, key))
+            state = sa.inspect(obj) if obj is not None else None
+            if state is None or state.expired or state.deleted or state.was_deleted:
+                to_load.append(key)
+            else:
+                found[key] = cast(T, obj)
+
+        names = self.model_metadata.primary_key_names
+        for chunk in more_itertools.chunked(to_load, self.BATCH_SIZE):
+            values = [key if isinstance(key, tuple) else (key,) for key in chunk]
+            stmt = self.get_query(
+                self._in_clause(names, values), joined_loads=joined_loads, load_strategy=load_strategy
+            )
+            for obj in self._execute(stmt, session=session).scalars().unique():
+                found[self._identity_key(obj)] = obj
+
+        if missing == 'raise':
+            not_found = [key for key in dict.fromkeys(keys) if key not in found]
+            if not_found:
+                raise NoResultFound(f'No {self.model_class.__name__} records with primary keys {not_found!r}')
+        if missing == 'none':
+            return [found.get(key) for key in keys]
+        return [found[key] for key in keys if key in found]
+
+    @instrumented
+    def find_named(self, name: str, **params: Any) -> Sequence[Any]:
+        """
+        Execute a query declared in QUERIES and fetch all results.
+
+        :param name: Key of the query in QUERIES.
+        :param params: Values of the query's bind parameters.
+        :returns: Sequence of model instances — or scalar values if the query selects a single column —
+                  or rows if it selects several entities or columns.
+        :raises KeyError: if QUERIES has no such query.
+        """
+
+        return self._named_result(name, params).all()
+
+    @instrumented
+    def get_named(self, name: str, **params: Any) -> Any:
+        """
+        Execute a query declared in QUERIES and fetch exactly one result.
+
+        :param name: Key of the query in QUERIES.
+        :param params: Values of the query's bind parameters.
+        :returns: See find_named.
+        :raises KeyError: if QUERIES has no such query.
+        :raises NoResultFound: if no record matches.
+        :raises MultipleResultsFound: if more than one record matches.
+        """
+
+        return self._named_result(name, params).one()
+
+    @instrumented
+    def prefetch(self, instances: Iterable[T], *relationships: Any) -> list[T]:
+        """
+        Load relationships of already loaded instances in bulk, avoiding one lazy load per instance.
+
+        Every relationship is loaded with one query per BATCH_SIZE instances — many-to-many ones
+        through their secondary table — and assigned as if it had been loaded by the ORM, so
+        accessing it later does not emit SQL. Relationships an instance has already loaded, or
+        changed, are left untouched.
+
+        Usage::
+
+            articles = repository.find(Article.group == 'python')
+            repository.prefetch(articles, Article.comments, Article.categories)
+
+        :param instances: MODEL_CLASS instances present in the session.
+        :param relationships: Relationship attributes of MODEL_CLASS, e.g. Article.comments.
+        :returns: The instances as a list.
+        :raises ValueError: if any instance is not of MODEL_CLASS type, or any attribute is not a
+                            relationship of MODEL_CLASS.
+        """
+
+        instances = list(instances)
+        self._validate_type(instances)
+        mapper = sa.inspect(self.model_class)
+        for attr in relationships:
+            prop = getattr(attr, 'property', None)
+            if not isinstance(prop, RelationshipProperty) or not mapper.isa(prop.parent):
+                raise ValueError(f'{attr} is not a relationship of {self.model_class.__name__}')
+
+            unloaded = [obj for obj in instances if prop.key in sa.inspect(obj).unloaded]
+            for chunk in more_itertools.chunked(unloaded, self.BATCH_SIZE):
+                self._prefetch_chunk(chunk, prop)
+        return instances
+
+    def _prefetch_chunk(self, chunk: list[T], prop: RelationshipProperty) -> None:
+        """
+        Load prop for a chunk of instances with a single query and set it on each of them.
+
+        The related records are joined to the instances through the relationship itself, so its
+        full join condition applies, including criteria beyond the foreign key columns.
+        """
+
+        session = object_session(chunk[0]) or self.session
+        pk_columns = self._primary_key_columns()
+        keys = [key for key in dict.fromkeys(sa.inspect(obj).identity for obj in chunk) if key is not None]
+        related: dict[tuple[Any, ...], list[Any]] = collections.defaultdict(list)
+        if keys:
+            # aliased, so that self-referential relationships join the parent and related tables apart
+            target = aliased(prop.mapper)
+            condition = (
+                sa.tuple_(*pk_columns).in_(keys) if len(pk_columns) > 1 else pk_columns[0].in_([key[0] for key in keys])
+            )
+            stmt = (
+                sa.select(target, *pk_columns)
+                .join_from(self.model_class, getattr(self.model_class, prop.key).of_type(target))
+                .where(condition)
+            )
+            if prop.order_by:
+                adapter = ClauseAdapter(sa.inspect(target).selectable)
+                stmt = stmt.order_by(*[adapter.traverse(column) for column in prop.order_by])
+
+            for row in self._execute(stmt, session=session):
+                related[tuple(row[1:])].append(row[0])
+
+        for obj in chunk:
+            values = related.get(sa.inspect(obj).identity or (), [])
+            set_committed_value(obj, prop.key, values if prop.uselist else next(iter(values), None))
+
+    @instrumented
+    def count(self, *where: ColumnElement, joins: list[Any] | None = None) -> int:
+        """
+        Count records matching the given filters with a single SELECT COUNT.
+
+        Records repeated by joins are counted once, consistently with find.
+
+        :param where: Column filter expressions (ANDed together). Omit to count all rows.
+        :param joins: See get_query.
+        :returns: Number of matched records.
+        """
+
+        if joins:
+            matched = self.get_query(*where, joins=joins, select=self._primary_key_columns()).distinct()
+            stmt = sa.select(sa.func.count()).select_from(matched.subquery())
+        else:
+            stmt = self.get_query(*where, select=(sa.func.count(),))
+        return self._execute(stmt).scalar_one()
+
+    @instrumented
+    def exists(self, *where: ColumnElement, joins: list[Any] | None = None) -> bool:
+        """
+        Check whether any record matches the given filters with a single SELECT EXISTS.
+
+        :param where: Column filter expressions (ANDed together). Omit to check if the table has any rows.
+        :param joins: See get_query.
+        :returns: True if at least one record matches.
+        """
+
+        matched = self.get_query(*where, joins=joins, select=(sa.literal(1),))
+        return bool(self._execute(sa.select(matched.exists())).scalar_one())
+
+    @instrumented
+    def aggregate(
+        self,
+        *where: ColumnElement,
+        joins: list[Any] | None = None,
+        group_by: tuple[Any, ...] = (),
+        order_by: ColumnElement | None = None,
+        row_type: Callable[..., Any] | None = None,
+        **aggregates: ColumnElement,
+    ) -> Sequence[Any]:
+        """
+        Compute aggregates in the database, optionally grouped.
+
+        Example::
+
+            repository.aggregate(group_by=(Article.group,), total=sa.func.count(Article.id))
+
+        :param where: Column filter expressions (ANDed together).
+        :param joins: See get_query.
+        :param group_by: Tuple of column expressions for GROUP BY. They are returned in front of the aggregates.
+        :param order_by: See get_query.
+        :param row_type: See get.
+        :param aggregates: Aggregate expressions such as sa.func.sum(Model.column), labeled with their keyword.
+        :returns: Sequence of rows, one per group (a single row if group_by is empty).
+        """
+
+        select = (*group_by, *[expression.label(name) for name, expression in aggregates.items()])
+        stmt = self.get_query(*where, joins=joins, order_by=order_by, select=select).group_by(*group_by)
+        rows = self._execute(stmt).all()
+        return rows if row_type is None else [self._convert_row(row, row_type) for row in rows]
+
+    def _convert_row(self, row: sa.Row, row_type: Callable[..., Any] | None) -> Any:
+        """Convert a projected row to row_type. See get for the supported types."""
+
+        if row_type is None:
+            return row
+        if row_type is dict:
+            return row._asdict()
+        return row_type(**row._mapping)
+
+    @instrumented
+    def iter_find(
+        self,
+        *where: ColumnElement,
+        joins: list[Any] | None = None,
+        order_by: ColumnElement | None = None,
+        joined_loads: tuple[Any, ...] | None = None,
+        load_strategy: LoadStrategy | None = None,
+        page_size: int | None = None,
+        expunge: bool = False,
+    ) -> Iterator[T]:
+        """
+        Iterate over all records matching the given filters, loading them page by page.
+
+        Pages are fetched with keyset (seek) pagination on order_by followed by the primary key,
+        so every page is a cheap indexed range scan regardless of how deep the iteration is.
+        Rows of a page are streamed with yield_per unless joins or joined eager loads are requested.
+
+        :param where: Column filter expressions (ANDed together). Omit to iterate over all rows.
+        :param joins: See get_query.
+        :param order_by: A single column expression, optionally with .asc()/.desc(). Defaults to the
+                         primary key. NULLs of a nullable column are yielded last, or first when descending.
+        :param joined_loads: See get_query.
+        :param load_strategy: See get_query.
+        :param page_size: Number of records per page. Defaults to BATCH_SIZE.
+        :param expunge: Expunge each page from the session once it has been consumed, so memory stays
+                        flat. Expunged instances are detached and can no longer lazy load.
+        :returns: Iterator over matched model instances.
+        """
+
+        pages = self._keyset_pages(
+            *where,
+            joins=joins,
+            order_by=order_by,
+            joined_loads=joined_loads,
+            load_strategy=load_strategy,
+            page_size=page_size,
+        )
+        session = self._read_session()
+        last_key: tuple[Any, ...] | None = None
+        while True:
+            rows = pages.filter(session.execute(pages.query(last_key))).all()
+            for row in rows:
+                yield row[0]
+
+            if expunge:
+                for row in rows:
+                    if row[0] in session:
+                        session.expunge(row[0])
+
+            last_key = pages.next_key(rows)
+            if last_key is None:
+                return
+
+    @instrumented
+    def find_columns(
+        self,
+        *where: ColumnElement,
+        columns: Sequence[Any] | None = None,
+        joins: list[Any] | None = None,
+        order_by: ColumnElement | None = None,
+        chunk_size: int | None = None,
+        backend: ColumnarBackend = 'auto',
+    ) -> dict[str, Any]:
         """
+        Export matching records column by column, for analytics.
 
-        stmt = self.get_query(*where, joins=joins, order_by=order_by, joined_loads=joined_loads)
-        return self.session.scalars(stmt).unique().all()
+        Rows are streamed from the cursor in chunks with yield_per and appended straight to one array
+        per column — no model instances are created and no per-row objects are kept. The result is not
+        cached. See ColumnBuilder for the array type built for every column. NumPy arrays are
+        preallocated from a SELECT COUNT of the matching rows, run before the export.
+
+        Example::
+
+            data = repository.find_columns(Article.group == 'python', columns=('id', 'title'))
+            data['id']  # array('q', [1, 2, 3]), or numpy.array([1, 2, 3]) if NumPy is installed
+
+        :param where: Column filter expressions (ANDed together). Omit to export all rows.
+        :param columns: Attribute names or column expressions to export. Defaults to all mapped columns.
+        :param joins: See get_query.
+        :param order_by: See get_query.
+        :param chunk_size: Number of rows fetched from the cursor at a time. Defaults to BATCH_SIZE.
+        :param backend: 'numpy', 'array' or 'list'. 'auto' picks 'numpy' if NumPy is installed, 'array' otherwise.
+        :returns: Dict mapping every column's name to its array of values.
+        :raises ImportError: if backend is 'numpy' and NumPy is not installed.
+        """
+
+        expressions = [
+            self.model_metadata.attribute(column) if isinstance(column, str) else column
+            for column in columns or self.model_metadata.columns
+        ]
+        stmt = self.get_query(*where, joins=joins, order_by=order_by, select=tuple(expressions))
+        session = self._read_session()
+        size = 0
+        if _resolve_backend(backend) == 'numpy':
+            # NumPy arrays are allocated once for all rows instead of concatenating chunks
+            size = session.execute(sa.select(sa.func.count()).select_from(stmt.order_by(None).subquery())).scalar_one()
+        builders = [ColumnBuilder(_python_type(expression.type), backend, size) for expression in expressions]
+
+        result = session.execute(stmt, execution_options={'yield_per': chunk_size or self.BATCH_SIZE})
+        for partition in result.partitions():
+            for builder, values in zip(builders, zip(*partition, strict=True), strict=True):
+                builder.extend(values)
+        return {name: builder.build() for name, builder in zip(result.keys(), builders, strict=True)}
 
     # write methods
+
+    @instrumented
     def create(self, **params: Any) -> T:
         """
-        Create and flush a new model instance.
+        Create and flush a new model instance. Within unit_of_work() the instance is only staged.
 
         :param params: Column values passed as keyword arguments to MODEL_CLASS.
         :returns: The newly created and flushed instance.
@@ -175,48 +1430,371 @@ class BaseRepository(Generic[T]):
         self._flush_obj(obj)
         return obj
 
-    def create_batch(self, instances: list[T]) -> list[T]:
+    @overload
+    def create_batch(
+        self, instances: Iterable[T], *, expunge: bool = ..., returning: Literal['instances'] = ...
+    ) -> list[T]: ...
+
+    @overload
+    def create_batch(self, instances: Iterable[T], *, expunge: bool = ..., returning: Literal['keys']) -> list[Any]: ...
+
+    @overload
+    def create_batch(self, instances: Iterable[T], *, expunge: bool = ..., returning: Literal['count']) -> int: ...
+
+    @instrumented
+    def create_batch(
+        self, instances: Iterable[T], *, expunge: bool = False, returning: BatchReturning = 'instances'
+    ) -> list[T] | list[Any] | int:
         """
-        Add and flush a list of pre-constructed model instances.
+        Add and flush pre-constructed model instances.
 
-        All instances are validated and inserted within a single savepoint. If any flush
-        fails the entire batch is rolled back atomically.
+        instances may be any iterable, e.g. a generator. It is consumed, validated and flushed
+        one BATCH_SIZE chunk at a time, so with expunge=True and returning='keys' or 'count'
+        memory use is bounded by BATCH_SIZE rather than by the input size.
 
-        :param instances: List of MODEL_CLASS instances to persist.
-        :returns: The same list of instances.
-        :raises ValueError: if any instance is not of MODEL_CLASS type.
+        All chunks are inserted within a single savepoint. If any flush fails the entire batch
+        is rolled back atomically. Within unit_of_work() the instances are only staged.
+
+        :param instances: Iterable of MODEL_CLASS instances to persist.
+        :param expunge: Expunge every chunk from the session once it has been flushed.
+        :param returning: What to return — 'instances', 'keys' for primary keys in input order
+                          (scalars for single-column keys, tuples for composite keys) or 'count'.
+        :returns: List of persisted instances, list of primary keys, or the number of inserted records.
+        :raises ValueError: if any instance is not of MODEL_CLASS type, or if expunge or
+                            returning='keys' is used within unit_of_work().
         """
 
-        self._validate_type(instances)
+        if self._deferred_threshold is not None:
+            if expunge or returning == 'keys':
+                raise ValueError("expunge and returning='keys' are not supported within unit_of_work()")
+
+            staged: list[T] = []
+            for chunk in more_itertools.chunked(instances, self.BATCH_SIZE):
+                self._validate_type(chunk)
+                self._stage(chunk)
+                staged.extend(chunk)
+            return len(staged) if returning == 'count' else staged
 
+        result: list[Any] = []
+        count = 0
         with self.session.begin_nested() as savepoint:
             try:
                 for chunk in more_itertools.chunked(instances, self.BATCH_SIZE):
+                    self._validate_type(chunk)
                     self.session.add_all(chunk)
                     self.session.flush()
+                    count += len(chunk)
+                    result.extend(self._batch_result(chunk, returning, expunge))
             except Exception as e:
                 savepoint.rollback()
                 raise e
-        return instances
+        self._record_write()
+        return count if returning == 'count' else result
+
+    @overload
+    def create_batch_from_dicts(
+        self,
+        data: Iterable[dict[str, Any]],
+        bulk: bool = ...,
+        *,
+        expunge: bool = ...,
+        returning: Literal['instances'] = ...,
+    ) -> list[T]: ...
+
+    @overload
+    def create_batch_from_dicts(
+        self, data: Iterable[dict[str, Any]], bulk: bool = ..., *, expunge: bool = ..., returning: Literal['keys']
+    ) -> list[Any]: ...
 
-    def create_batch_from_dicts(self, data: list[dict[str, Any]]) -> list[T]:
+    @overload
+    def create_batch_from_dicts(
+        self, data: Iterable[dict[str, Any]], bulk: bool = ..., *, expunge: bool = ..., returning: Literal['count']
+    ) -> int: ...
+
+    @instrumented
+    def create_batch_from_dicts(
+        self,
+        data: Iterable[dict[str, Any]],
+        bulk: bool = False,
+        *,
+        expunge: bool = False,
+        returning: BatchReturning = 'instances',
+    ) -> list[T] | list[Any] | int:
         """
-        Create and flush model instances from a list of attribute dicts.
+        Create and flush model instances from attribute dicts.
 
+        data may be any iterable and is consumed one BATCH_SIZE chunk at a time — see create_batch.
         All creates are performed within a single savepoint. If any insert fails the
         entire batch is rolled back atomically.
 
-        :param data: List of dicts mapping column names to values.
-        :returns: List of newly created and flushed instances.
+        :param data: Iterable of dicts mapping column names to values.
+        :param bulk: Send every BATCH_SIZE chunk as one executemany INSERT ... RETURNING instead
+                     of going through the unit of work. Dicts may only contain column attributes
+                     — relationships are not supported in this mode.
+        :param expunge: See create_batch.
+        :param returning: See create_batch. With bulk=True, 'keys' and 'count' skip loading instances.
+        :returns: List of created instances, list of primary keys, or the number of inserted records.
         """
 
-        instances: list[T] = []
+        if self._deferred_threshold is not None and not bulk:
+            return self.create_batch((self.model_class(**item) for item in data), expunge=expunge, returning=returning)
+
+        result: list[Any] = []
+        count = 0
         with self.session.begin_nested() as savepoint:
             try:
                 for chunk in more_itertools.chunked(data, self.BATCH_SIZE):
-                    result = [self.create(**item) for item in chunk]
-                    instances.extend(result)
+                    count += len(chunk)
+                    if bulk and returning != 'instances':
+                        keys = self._bulk_insert(chunk, return_instances=False)
+                        if returning == 'keys':
+                            result.extend(keys)
+                        continue
+
+                    if bulk:
+                        instances = self._bulk_insert(chunk, return_instances=True)
+                    else:
+                        instances = [self.model_class(**item) for item in chunk]
+                        self.session.add_all(instances)
+                        self.session.flush()
+                    result.extend(self._batch_result(instances, returning, expunge))
             except Exception as e:
                 savepoint.rollback()
                 raise e
-        return instances
+        self._record_write()
+        return count if returning == 'count' else result
+
+    def _batch_result(self, chunk: list[T], returning: BatchReturning, expunge: bool) -> list[Any]:
+        """Return what a batch method reports for a flushed chunk, expunging it first if requested."""
+
+        result = [self._identity_key(obj) for obj in chunk] if returning == 'keys' else chunk
+        if expunge:
+            for obj in chunk:
+                self.session.expunge(obj)
+        return result if returning != 'count' else []
+
+    @instrumented
+    def insert_batch_from_dicts(self, data: Iterable[dict[str, Any]]) -> list[Any]:
+        """
+        Insert rows from attribute dicts without building ORM instances.
+
+        Shorthand for create_batch_from_dicts(data, bulk=True, returning='keys').
+
+        :param data: Iterable of dicts mapping column names to values. Relationships are not supported.
+        :returns: Primary keys of the inserted rows in input order — scalars for single-column keys,
+                  tuples for composite keys.
+        """
+
+        return self.create_batch_from_dicts(data, bulk=True, returning='keys')
+
+    @instrumented
+    def upsert_batch(
+        self, rows: list[dict[str, Any]], conflict_columns: Sequence[str], update_columns: Sequence[str] | None = None
+    ) -> list[Any]:
+        """
+        Insert rows, updating the ones that conflict with an existing record.
+
+        On SQLite and PostgreSQL every BATCH_SIZE chunk is sent as one INSERT ... ON CONFLICT DO UPDATE
+        statement. Other dialects look up existing rows per chunk and update them through the unit of
+        work. All chunks are processed within a single savepoint and rolled back atomically on failure.
+
+        Instances already loaded in the session are not refreshed — use session.refresh() or
+        populate_existing if you need to see updated values.
+
+        :param rows: List of dicts mapping column names to values. All dicts must contain conflict_columns.
+        :param conflict_columns: Names of the columns forming the unique constraint to detect conflicts on.
+        :param update_columns: Names of the columns to overwrite on conflict. Defaults to every key
+                               of the first row except conflict_columns and the primary key. Pass an
+                               empty sequence to leave conflicting rows untouched (DO NOTHING).
+        :returns: Primary keys of inserted and updated rows. Rows skipped by DO NOTHING are not included.
+        :raises ValueError: if update_columns contains a primary key column.
+        :raises IntegrityError: if a chunk contains the same conflict key twice (PostgreSQL).
+        """
+
+        primary_key_names = self.model_metadata.primary_key_names
+        if update_columns is not None and (updated_keys := [n for n in update_columns if n in primary_key_names]):
+            raise ValueError(f'update_columns must not contain primary key columns, got {updated_keys}')
+        if not rows:
+            return []
+
+        if update_columns is None:
+            update_columns = [
+                name for name in rows[0] if name not in conflict_columns and name not in primary_key_names
+            ]
+
+        upsert_chunk = self._upsert_chunk if self._get_upsert_insert() else self._upsert_chunk_fallback
+        keys: list[Any] = []
+        with self.session.begin_nested() as savepoint:
+            try:
+                for chunk in more_itertools.chunked(rows, self.BATCH_SIZE):
+                    keys.extend(upsert_chunk(chunk, conflict_columns, update_columns))
+            except Exception as e:
+                savepoint.rollback()
+                raise e
+        self._record_write()
+        return keys
+
+    @instrumented
+    def update_where(
+        self, *where: ColumnElement, synchronize_session: SynchronizeSession | None = None, **values: Any
+    ) -> int:
+        """
+        Update all records matching the given filters with a single UPDATE statement.
+
+        Records are not loaded into the session.
+
+        :param where: Column filter expressions (ANDed together). Omit to update all rows.
+        :param synchronize_session: How instances already in the session are brought up to date —
+                                    see Session.execute's synchronize_session option. Defaults to
+                                    SYNCHRONIZE_SESSION.
+        :param values: Column values to set, passed as keyword arguments.
+        :returns: Number of updated rows.
+        """
+
+        stmt = sa.update(self.model_class).where(*where).values(**values)
+        result = self.session.execute(
+            stmt, execution_options={'synchronize_session': self._synchronize_session(synchronize_session)}
+        )
+        self._record_write()
+        return cast(sa.CursorResult, result).rowcount
+
+    @instrumented
+    def delete_where(self, *where: ColumnElement, synchronize_session: SynchronizeSession | None = None) -> int:
+        """
+        Delete all records matching the given filters with a single DELETE statement.
+
+        Records are not loaded into the session.
+
+        :param where: Column filter expressions (ANDed together). Omit to delete all rows.
+        :param synchronize_session: See update_where.
+        :returns: Number of deleted rows.
+        """
+
+        stmt = sa.delete(self.model_class).where(*where)
+        result = self.session.execute(
+            stmt, execution_options={'synchronize_session': self._synchronize_session(synchronize_session)}
+        )
+        self._record_write()
+        return cast(sa.CursorResult, result).rowcount
+
+    @instrumented
+    def load_file(
+        self,
+        source: str | os.PathLike[str] | IO[str],
+        format: FileFormat | None = None,
+        *,
+        encoding: str = 'utf-8',
+        on_progress: Callable[[LoadReport], None] | None = None,
+        quarantine: str | os.PathLike[str] | IO[str] | None = None,
+    ) -> LoadReport:
+        """
+        Stream records from a CSV or NDJSON file into MODEL_CLASS's table.
+
+        The source is read lazily, BATCH_SIZE records at a time. Values are converted to the
+        Python types of the mapped columns (see RowCoercer) and every chunk is inserted with one
+        executemany INSERT within its own savepoint, so memory use is bounded by BATCH_SIZE.
+
+        Records that cannot be converted are rejected. If a chunk fails with an IntegrityError or
+        DataError its records are retried one by one and only the failing ones are rejected.
+        Atomicity is therefore per record — commit or roll back the session to accept or discard
+        the whole load.
+
+        :param source: Path to the file or a file-like object opened in text mode.
+        :param format: 'csv' or 'ndjson'. Inferred from the file name's suffix if omitted.
+        :param encoding: Encoding used to open source and quarantine paths.
+        :param on_progress: Called with the LoadReport after every chunk.
+        :param quarantine: Path or text file-like object rejected records are written to as NDJSON
+                           ({"line": ..., "record": ..., "error": ...}). When omitted they are kept
+                           in LoadReport.rejected.
+        :returns: LoadReport with row counts, duration and throughput.
+        :raises ValueError: if format is omitted and cannot be inferred.
+        """
+
+        coerce = RowCoercer(self.model_class)
+        report = LoadReport()
+        with contextlib.ExitStack() as stack:
+            if isinstance(quarantine, (str, os.PathLike)):
+                quarantine = stack.enter_context(open(quarantine, 'w', encoding=encoding))
+
+            def reject(line: int, record: dict[str, Any], error: str) -> None:
+                rejected = RejectedRow(line, record, error)
+                report.rows_rejected += 1
+                if quarantine is None:
+                    report.rejected.append(rejected)
+                else:
+                    quarantine.write(json.dumps(rejected.as_dict(), default=str) + '\n')
+
+            for chunk in more_itertools.chunked(read_records(source, format, encoding), self.BATCH_SIZE):
+                rows: list[tuple[int, dict[str, Any], dict[str, Any]]] = []
+                for line, record in chunk:
+                    try:
+                        rows.append((line, record, coerce(record)))
+                    except ValueError as e:
+                        reject(line, record, str(e))
+
+                report.rows_read += len(chunk)
+                report.rows_inserted += self._load_chunk(rows, reject)
+                report.chunks += 1
+                report.update_duration()
+                if on_progress is not None:
+                    on_progress(report)
+
+        self._record_write()
+        report.update_duration()
+        return report
+
+    def _load_chunk(
+        self, rows: list[tuple[int, dict[str, Any], dict[str, Any]]], reject: Callable[[int, dict[str, Any], str], None]
+    ) -> int:
+        """Insert a chunk of (line, record, values) rows for load_file and return the number of inserted rows."""
+
+        if not rows:
+            return 0
+
+        stmt = sa.insert(self.model_class)
+        try:
+            with self.session.begin_nested():
+                self.session.execute(stmt, [values for _, _, values in rows])
+            return len(rows)
+        except (IntegrityError, DataError):
+            pass
+
+        inserted = 0
+        for line, record, values in rows:
+            try:
+                with self.session.begin_nested():
+                    self.session.execute(stmt, [values])
+                inserted += 1
+            except (IntegrityError, DataError) as e:
+                reject(line, record, str(e.orig))
+        return inserted
+
+    @instrumented
+    def update_batch_from_dicts(self, data: list[dict[str, Any]]) -> int:
+        """
+        Apply per-row changes identified by primary key.
+
+        Every BATCH_SIZE chunk is sent as one executemany UPDATE ... WHERE <primary key>. All updates
+        are performed within a single savepoint and rolled back atomically on failure.
+
+        :param data: List of dicts containing the primary key and the column values to set.
+        :returns: Number of rows submitted, len(data). ORM bulk UPDATE does not report per-row counts —
+                  a primary key that matches no record raises StaleDataError instead, on dialects
+                  reporting executemany rowcounts.
+        :raises StaleDataError: if any primary key does not match a record.
+        """
+
+        with self.session.begin_nested() as savepoint:
+            try:
+                for chunk in more_itertools.chunked(data, self.BATCH_SIZE):
+                    self.session.execute(sa.update(self.model_class), chunk)
+            except Exception as e:
+                savepoint.rollback()
+                raise e
+        self._record_write()
+        return len(data)
+
+    def _synchronize_session(self, synchronize_session: SynchronizeSession | None) -> SynchronizeSession:
+        """Return synchronize_session, or the repository default if it is None."""
+
+        return self.SYNCHRONIZE_SESSION if synchronize_session is None else synchronize_session
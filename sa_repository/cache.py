@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Iterable
+
+__all__ = ['CacheBackend', 'CacheStats', 'LRUCache']
+
+
+class CacheStats:
+    """Counters of a cache backend. Repositories count hits and misses, backends count evictions."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the counters as a dict, e.g. to export them to a metrics system."""
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'evictions': self.evictions,
+        }
+
+    def reset(self) -> None:
+        """Set all counters back to zero."""
+
+        self.hits = self.misses = self.invalidations = self.evictions = 0
+
+
+class CacheBackend(ABC):
+    """
+    Storage of serialized query results used by BaseRepository's read-through cache.
+
+    Every entry is stored with a set of tags — names of the tables the cached query reads from —
+    so that a write to a table can drop all entries depending on it.
+
+    Values are pickled query results and are unpickled when read, which can execute arbitrary code.
+    A backend backed by a shared store, e.g. Redis, must only be writable by trusted processes.
+    """
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        """Return the value stored under key, or None if it is missing or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, tags: Iterable[str]) -> None:
+        """Store value under key and associate it with tags."""
+
+    @abstractmethod
+    def invalidate(self, tags: Iterable[str]) -> None:
+        """Drop every entry associated with any of the tags."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop all entries."""
+
+
+class LRUCache(CacheBackend):
+    """
+    Thread-safe in-process cache evicting the least recently used entries.
+
+    :param maxsize: Maximum number of entries kept.
+    :param ttl: Seconds after which an entry expires. None keeps entries until evicted or invalidated.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None):
+        super().__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float | None, bytes, frozenset[str]]] = OrderedDict()
+        self._keys_by_tag: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value, _ = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, tags: Iterable[str]) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        tags = frozenset(tags)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, value, tags)
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                for key in self._keys_by_tag.pop(tag, set()):
+                    self._remove(key)
+            self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_tag.clear()
+
+    def _remove(self, key: str) -> None:
+        """Remove key from the entries and the tag index. Must be called with the lock held."""
+
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import array
+import math
+from typing import Any, Literal, Sequence
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - numpy is optional
+    numpy = None  # type: ignore[assignment]
+
+__all__ = ['ColumnBuilder', 'ColumnarBackend']
+
+ColumnarBackend = Literal['auto', 'numpy', 'array', 'list']
+
+_TYPECODES: dict[type, str] = {int: 'q', float: 'd', bool: 'b'}
+
+
+def _resolve_backend(backend: ColumnarBackend) -> ColumnarBackend:
+    """Return the backend 'auto' stands for, or backend itself."""
+
+    if backend == 'auto':
+        return 'array' if numpy is None else 'numpy'
+    return backend
+
+
+class ColumnBuilder:
+    """
+    Accumulates the values of one result column, chunk by chunk, into a compact array.
+
+    Depending on backend the column becomes:
+
+    - 'numpy': a NumPy array — int64, float64 or bool for such columns, object for any other type,
+    - 'array': an array.array with typecode 'q', 'd' or 'b' for int, float and bool columns, a list otherwise,
+    - 'list': a list.
+
+    NULLs become NaN in float columns. An int or bool column containing NULL falls back to an object
+    array or list.
+
+    NumPy arrays are allocated once for size values and filled in place, growing by doubling if more
+    values arrive, so no chunk copies are concatenated at the end. The other backends append.
+
+    :param python_type: Python type of the column, or None if unknown.
+    :param backend: 'numpy', 'array' or 'list'. 'auto' picks 'numpy' if NumPy is installed, 'array' otherwise.
+    :param size: Expected number of values, used to preallocate NumPy arrays.
+    :raises ImportError: if backend is 'numpy' and NumPy is not installed.
+    """
+
+    def __init__(self, python_type: type | None, backend: ColumnarBackend = 'auto', size: int = 0):
+        backend = _resolve_backend(backend)
+        if backend == 'numpy' and numpy is None:
+            raise ImportError('NumPy is required for the numpy backend, install it or use the array backend')
+
+        self.backend = backend
+        self.python_type = python_type if python_type in _TYPECODES else None
+        self._length = 0
+        self._data: Any
+        if backend == 'numpy':
+            self._data = numpy.empty(size, dtype=object if self.python_type is None else self.python_type)
+        elif backend == 'array' and self.python_type is not None:
+            self._data = array.array(_TYPECODES[self.python_type])
+        else:
+            self._data = []
+
+    def extend(self, values: Sequence[Any]) -> None:
+        """Append a chunk of values."""
+
+        if self.python_type is float:
+            values = [math.nan if value is None else value for value in values]
+        elif self.python_type is not None and None in values:
+            self._to_objects()
+
+        if self.backend != 'numpy':
+            self._data.extend(values)
+            return
+
+        end = self._length + len(values)
+        if end > len(self._data):
+            self._data = numpy.resize(self._data, max(end, 2 * len(self._data)))
+        # sequence values, e.g. of JSON columns, must not be broadcast into an object array
+        chunk = numpy.fromiter(values, dtype=object, count=len(values)) if self.python_type is None else values
+        self._data[self._length : end] = chunk
+        self._length = end
+
+    def build(self) -> Any:
+        """Return the accumulated column."""
+
+        if self.backend != 'numpy':
+            return self._data
+        if self._length < len(self._data):
+            self._data = self._data[: self._length].copy()
+        return self._data
+
+    def _to_objects(self) -> None:
+        """Switch an int or bool column to generic objects once it turns out to contain NULLs."""
+
+        self.python_type = None
+        if self.backend == 'numpy':
+            self._data = self._data.astype(object)
+        else:
+            self._data = self._data.tolist() if isinstance(self._data, array.array) else self._data
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import collections
+import contextlib
+import functools
+import inspect
+import time
+from typing import Any, Callable, Iterator, Sequence, TypeVar
+
+from sqlalchemy import Connection, event
+from sqlalchemy.orm import Session
+
+__all__ = ['Instrumentation', 'MetricsCollector', 'OperationStats', 'instrumented']
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+
+class OperationStats:
+    """
+    Cost of one logical operation — a repository method call or a block wrapped in Instrumentation.operation().
+
+    :ivar name: Operation name, e.g. 'ArticleRepository.find'.
+    :ivar statements: SQL statements sent to the database, in order.
+    :ivar savepoints: Number of savepoints opened.
+    :ivar duration: Wall time in seconds.
+    :ivar rows: Number of records returned, or None if the operation does not return records.
+    :ivar n_plus_one: (statement, count) pairs of SELECTs repeated at least n_plus_one_threshold times.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.statements: list[str] = []
+        self.savepoints = 0
+        self.duration = 0.0
+        self.rows: int | None = None
+        self.n_plus_one: list[tuple[str, int]] = []
+
+    def __repr__(self) -> str:
+        return (
+            f'<OperationStats {self.name} statements={len(self.statements)} savepoints={self.savepoints} '
+            f'duration={self.duration:.6f} rows={self.rows}>'
+        )
+
+    def set_rows(self, result: Any) -> None:
+        """Derive rows from an operation's return value."""
+
+        if result is None:
+            self.rows = 0
+        elif isinstance(result, list):
+            self.rows = len(result)
+        elif not isinstance(result, (int, bool)):
+            self.rows = 1
+
+
+class Instrumentation:
+    """
+    Records the cost of repository operations and passes it to a sink.
+
+    Assign an instance to a repository's INSTRUMENTATION attribute to enable it. When unset
+    repositories skip it entirely.
+
+    :param sink: Callable receiving the OperationStats of every finished operation.
+    :param n_plus_one_threshold: Number of identical SELECT statements within one operation
+                                 from which they are reported as an N+1 pattern.
+    """
+
+    def __init__(self, sink: Callable[[OperationStats], None] | None = None, n_plus_one_threshold: int = 5):
+        self.sink = sink
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    @contextlib.contextmanager
+    def operation(self, session: Session | Sequence[Session], name: str) -> Iterator[OperationStats]:
+        """
+        Record every statement the sessions send within the block as one operation.
+
+        Use it to group several repository calls and the lazy loads between them, e.g. a whole request
+        handler, so N+1 patterns spanning them are detected.
+
+        :param session: Session to record, or several — e.g. a primary session and its read replicas.
+                        Connections are recorded from the moment a session acquires them, so the
+                        block never opens a connection itself.
+        """
+
+        stats = OperationStats(name)
+        sessions = [session] if isinstance(session, Session) else list(session)
+        connections: list[Connection] = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            stats.statements.append(statement)
+
+        def savepoint(conn, name):
+            stats.savepoints += 1
+
+        def listen(connection: Connection) -> None:
+            if not any(connection is listened for listened in connections):
+                event.listen(connection, 'before_cursor_execute', before_cursor_execute)
+                event.listen(connection, 'savepoint', savepoint)
+                connections.append(connection)
+
+        def after_begin(session, transaction, connection):
+            listen(connection)
+
+        for item in sessions:
+            if item.in_transaction():
+                listen(item.connection())
+            event.listen(item, 'after_begin', after_begin)
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.duration = time.perf_counter() - start
+            for item in sessions:
+                event.remove(item, 'after_begin', after_begin)
+            for connection in connections:
+                event.remove(connection, 'before_cursor_execute', before_cursor_execute)
+                event.remove(connection, 'savepoint', savepoint)
+            stats.n_plus_one = self._find_n_plus_one(stats.statements)
+            if self.sink is not None:
+                self.sink(stats)
+
+    def _find_n_plus_one(self, statements: Sequence[str]) -> list[tuple[str, int]]:
+        """Return SELECT statements repeated at least n_plus_one_threshold times with their counts."""
+
+        counter = collections.Counter(s for s in statements if s.lstrip()[:6].upper() == 'SELECT')
+        return [(statement, count) for statement, count in counter.items() if count >= self.n_plus_one_threshold]
+
+
+class MetricsCollector:
+    """
+    Sink aggregating OperationStats per operation name, ready to be scraped.
+
+    Usage::
+
+        metrics = MetricsCollector()
+        ArticleRepository.INSTRUMENTATION = Instrumentation(sink=metrics)
+        ...
+        metrics.as_dict()
+    """
+
+    FIELDS = ('calls', 'statements', 'savepoints', 'duration', 'rows', 'n_plus_one')
+
+    def __init__(self) -> None:
+        self.metrics: dict[str, dict[str, float]] = collections.defaultdict(lambda: dict.fromkeys(self.FIELDS, 0))
+
+    def __call__(self, stats: OperationStats) -> None:
+        metrics = self.metrics[stats.name]
+        metrics['calls'] += 1
+        metrics['statements'] += len(stats.statements)
+        metrics['savepoints'] += stats.savepoints
+        metrics['duration'] += stats.duration
+        metrics['rows'] += stats.rows or 0
+        metrics['n_plus_one'] += len(stats.n_plus_one)
+
+    def as_dict(self) -> dict[str, dict[str, float]]:
+        """Return the aggregated metrics keyed by operation name."""
+
+        return {name: dict(metrics) for name, metrics in self.metrics.items()}
+
+    def reset(self) -> None:
+        """Drop all aggregated metrics."""
+
+        self.metrics.clear()
+
+
+def instrumented(method: F) -> F:
+    """
+    Record calls of a repository method with the repository's INSTRUMENTATION, if set.
+
+    Calls made from within another instrumented method of the same repository are part of the
+    outer operation. Generator methods are recorded until the generator is exhausted or closed,
+    including repository calls made while the generator is suspended.
+    """
+
+    if inspect.isgeneratorfunction(method):
+
+        @functools.wraps(method)
+        def generator_wrapper(self, *args, **kwargs):
+            if self.INSTRUMENTATION is None or self._instrumented_operation:
+                yield from method(self, *args, **kwargs)
+                return
+
+            self._instrumented_operation = True
+            try:
+                with self.INSTRUMENTATION.operation(
+                    self._sessions(), f'{type(self).__name__}.{method.__name__}'
+                ) as stats:
+                    stats.rows = 0
+                    for item in method(self, *args, **kwargs):
+                        stats.rows += 1
+                        yield item
+            finally:
+                self._instrumented_operation = False
+
+        return generator_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.INSTRUMENTATION is None or self._instrumented_operation:
+            return method(self, *args, **kwargs)
+
+        self._instrumented_operation = True
+        try:
+            with self.INSTRUMENTATION.operation(self._sessions(), f'{type(self).__name__}.{method.__name__}') as stats:
+                result = method(self, *args, **kwargs)
+                stats.set_rows(result)
+                return result
+        finally:
+            self._instrumented_operation = False
+
+    return wrapper  # type: ignore[return-value]
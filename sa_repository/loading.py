@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import csv
+import datetime
+import decimal
+import json
+import os
+import time
+import uuid
+from typing import IO, Any, Callable, Iterator, Literal
+
+import sqlalchemy as sa
+from sqlalchemy.orm import DeclarativeBase
+
+__all__ = ['FileFormat', 'LoadReport', 'RejectedRow', 'RowCoercer', 'read_records']
+
+FileFormat = Literal['csv', 'ndjson']
+
+_SUFFIXES: dict[str, FileFormat] = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+_TRUE = frozenset(('1', 'true', 't', 'yes', 'y'))
+_FALSE = frozenset(('0', 'false', 'f', 'no', 'n'))
+
+
+class RejectedRow:
+    """
+    Input record that could not be loaded.
+
+    :ivar line: Line number of the record in the source, starting at 1. For CSV it is the line
+                the record ends on, the header being line 1.
+    :ivar record: The record as read from the source, before coercion.
+    :ivar error: Description of the failure.
+    """
+
+    def __init__(self, line: int, record: dict[str, Any], error: str):
+        self.line = line
+        self.record = record
+        self.error = error
+
+    def __repr__(self) -> str:
+        return f'<RejectedRow line={self.line} error={self.error!r}>'
+
+    def as_dict(self) -> dict[str, Any]:
+        return {'line': self.line, 'record': self.record, 'error': self.error}
+
+
+class LoadReport:
+    """
+    Progress and outcome of BaseRepository.load_file, updated after every chunk.
+
+    :ivar rows_read: Number of records read from the source.
+    :ivar rows_inserted: Number of records inserted.
+    :ivar rows_rejected: Number of records that failed coercion or insertion.
+    :ivar chunks: Number of chunks processed.
+    :ivar duration: Wall time in seconds since the load started.
+    :ivar rejected: Rejected records, unless they are written to a quarantine file instead.
+    """
+
+    def __init__(self) -> None:
+        self.rows_read = 0
+        self.rows_inserted = 0
+        self.rows_rejected = 0
+        self.chunks = 0
+        self.duration = 0.0
+        self.rejected: list[RejectedRow] = []
+        self._start = time.perf_counter()
+
+    def __repr__(self) -> str:
+        return (
+            f'<LoadReport read={self.rows_read} inserted={self.rows_inserted} rejected={self.rows_rejected} '
+            f'duration={self.duration:.3f} rows_per_second={self.rows_per_second:.0f}>'
+        )
+
+    @property
+    def rows_per_second(self) -> float:
+        """Throughput of records read, inserted or rejected."""
+
+        return self.rows_read / self.duration if self.duration else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters as a dict, e.g. to log them or export them to a metrics system."""
+
+        return {
+            'rows_read': self.rows_read,
+            'rows_inserted': self.rows_inserted,
+            'rows_rejected': self.rows_rejected,
+            'chunks': self.chunks,
+            'duration': self.duration,
+            'rows_per_second': self.rows_per_second,
+        }
+
+    def update_duration(self) -> None:
+        self.duration = time.perf_counter() - self._start
+
+
+def read_records(
+    source: str | os.PathLike[str] | IO[str], format: FileFormat | None = None, encoding: str = 'utf-8'
+) -> Iterator[tuple[int, dict[str, Any]]]:
+    """
+    Lazily read records from a CSV or NDJSON file or text file-like object.
+
+    CSV files must have a header row. Blank NDJSON lines are skipped.
+
+    :param source: Path to the file or a file-like object opened in text mode.
+    :param format: 'csv' or 'ndjson'. Inferred from the file name's suffix (.csv, .ndjson, .jsonl) if omitted.
+    :param encoding: Encoding used to open paths.
+    :returns: Iterator over (line number, record) pairs.
+    :raises ValueError: if format is omitted and cannot be inferred.
+    """
+
+    if format is None:
+        name = source if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', '')
+        format = _SUFFIXES.get(os.path.splitext(os.fspath(name))[1].lower())
+        if format is None:
+            raise ValueError(f'Cannot infer the format of {source!r}, pass format="csv" or format="ndjson"')
+
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding=encoding, newline='') as file:
+            yield from _read(file, format)
+    else:
+        yield from _read(source, format)
+
+
+def _read(file: IO[str], format: FileFormat) -> Iterator[tuple[int, dict[str, Any]]]:
+    if format == 'csv':
+        reader = csv.DictReader(file)
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, {'__line__': line.rstrip('\n'), '__error__': f'Invalid JSON: {e}'}
+            continue
+        if not isinstance(record, dict):
+            record = {'__line__': line.rstrip('\n'), '__error__': 'Record is not a JSON object'}
+        yield line_number, record
+
+
+class RowCoercer:
+    """
+    Convert raw records to attribute dicts using the mapped column types of a model.
+
+    Strings are parsed into the column's Python type — ints, floats, decimals, booleans
+    (1/0, true/false, t/f, yes/no, y/n), ISO 8601 dates, times and datetimes and UUIDs.
+    Values already of the right type are kept. Empty CSV fields become None.
+
+    :param model_class: Mapped class whose column attributes define accepted keys and types.
+    :param empty_as_null: Treat empty strings as None.
+    """
+
+    def __init__(self, model_class: type[DeclarativeBase], empty_as_null: bool = True):
+        self.empty_as_null = empty_as_null
+        self.converters: dict[str, tuple[type | None, Callable[[Any], Any]]] = {}
+        for attr in sa.inspect(model_class).column_attrs:
+            python_type = _python_type(attr.columns[0].type)
+            self.converters[attr.key] = (python_type, _converter(python_type))
+
+    def __call__(self, record: dict[str, Any]) -> dict[str, Any]:
+        """
+        Return record with its values converted.
+
+        :raises ValueError: if the record has unknown keys or a value cannot be converted.
+        """
+
+        if '__error__' in record:
+            raise ValueError(record['__error__'])
+
+        result: dict[str, Any] = {}
+        for key, value in record.items():
+            try:
+                python_type, converter = self.converters[key]
+            except KeyError:
+                raise ValueError(f'Unknown column {key!r}') from None
+
+            if value is None or (value == '' and self.empty_as_null):
+                result[key] = None
+            elif python_type is None or (isinstance(value, python_type) and not isinstance(value, bool)):
+                result[key] = value
+            else:
+                try:
+                    result[key] = converter(value)
+                except (TypeError, ValueError, ArithmeticError) as e:
+                    raise ValueError(f'Invalid value {value!r} for column {key!r}: {e}') from None
+        return result
+
+
+def _python_type(column_type: sa.types.TypeEngine) -> type | None:
+    try:
+        return column_type.python_type
+    except NotImplementedError:
+        return None
+
+
+def _converter(python_type: type | None) -> Callable[[Any], Any]:
+    if python_type is bool:
+        return _to_bool
+    if python_type is int:
+        return _to_int
+    if python_type is datetime.datetime:
+        return datetime.datetime.fromisoformat
+    if python_type is datetime.date:
+        return datetime.date.fromisoformat
+    if python_type is datetime.time:
+        return datetime.time.fromisoformat
+    if python_type is decimal.Decimal:
+        return lambda value: decimal.Decimal(str(value))
+    if python_type is uuid.UUID:
+        return lambda value: uuid.UUID(str(value))
+    if python_type in (str, float, bytes):
+        return python_type
+    return lambda value: value
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in _TRUE | _FALSE:
+        return value.strip().lower() in _TRUE
+    raise ValueError('expected a boolean')
+
+
+def _to_int(value: Any) -> int:
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError('expected an integer')
+    if isinstance(value, bool):
+        raise ValueError('expected an integer')
+    return int(value)
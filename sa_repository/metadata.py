@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import functools
+from typing import Any, Literal
+
+import sqlalchemy as sa
+from sqlalchemy import ColumnElement
+from sqlalchemy.orm import MANYTOMANY, MANYTOONE, ONETOMANY, DeclarativeBase, Mapper
+
+__all__ = ['ModelMetadata', 'RelationshipKind', 'model_metadata']
+
+RelationshipKind = Literal['many_to_one', 'one_to_many', 'many_to_many']
+
+_RELATIONSHIP_KINDS: dict[Any, RelationshipKind] = {
+    MANYTOONE: 'many_to_one',
+    ONETOMANY: 'one_to_many',
+    MANYTOMANY: 'many_to_many',
+}
+
+
+class ModelMetadata:
+    """
+    Mapper information of a model class, computed once and shared by all repositories of the model.
+
+    :ivar model_class: The model class.
+    :ivar attributes: Class attributes of all mapped columns and relationships, keyed by attribute name.
+    :ivar columns: Column attribute names.
+    :ivar primary_key: Primary key columns of the mapped table.
+    :ivar primary_key_names: Attribute names of the primary key columns.
+    :ivar autoincrement: True if the table has a single autoincrement primary key column.
+    :ivar unique_constraints: Attribute names of every unique constraint, unique index and unique column.
+    :ivar relationships: Kind of every relationship, keyed by attribute name.
+    :ivar tables: Names of the tables written by the model — its own tables and its relationships' secondaries.
+    :ivar select: SELECT of the model without any criteria, the base of every get_query statement.
+    """
+
+    def __init__(self, model_class: type[DeclarativeBase]):
+        mapper: Mapper[Any] = sa.inspect(model_class)
+        table = mapper.local_table
+
+        self.model_class = model_class
+        self.attributes: dict[str, Any] = {attr.key: getattr(model_class, attr.key) for attr in mapper.attrs}
+        self.columns: tuple[str, ...] = tuple(attr.key for attr in mapper.column_attrs)
+        self.primary_key: tuple[ColumnElement, ...] = tuple(mapper.primary_key)
+        self.primary_key_names: tuple[str, ...] = tuple(
+            mapper.get_property_by_column(column).key for column in mapper.primary_key
+        )
+        self.autoincrement = (
+            isinstance(table, sa.Table) and len(self.primary_key) == 1 and table.autoincrement_column is not None
+        )
+
+        attribute_names = {column: attr.key for attr in mapper.column_attrs for column in attr.columns}
+        unique: list[tuple[str, ...]] = []
+        if isinstance(table, sa.Table):
+            unique.extend(
+                tuple(attribute_names.get(column, column.key) for column in constraint.columns)
+                for constraint in table.constraints
+                if isinstance(constraint, sa.UniqueConstraint)
+            )
+            unique.extend(
+                tuple(attribute_names.get(column, column.key) for column in index.columns)
+                for index in table.indexes
+                if index.unique
+            )
+            unique.extend((attribute_names.get(column, column.key),) for column in table.columns if column.unique)
+        self.unique_constraints: tuple[tuple[str, ...], ...] = tuple(dict.fromkeys(unique))
+
+        self.relationships: dict[str, RelationshipKind] = {
+            rel.key: _RELATIONSHIP_KINDS[rel.direction] for rel in mapper.relationships
+        }
+        tables = [*mapper.tables, *(rel.secondary for rel in mapper.relationships if rel.secondary is not None)]
+        self.tables: frozenset[str] = frozenset(table.name for table in tables if isinstance(table, sa.Table))
+        self.select: sa.Select = sa.select(model_class)
+
+    def __repr__(self) -> str:
+        return f'<ModelMetadata columns={self.columns} relationships={self.relationships}>'
+
+    def attribute(self, name: str) -> Any:
+        """
+        Return the class attribute called name.
+
+        Mapped attributes are looked up in attributes, anything else — e.g. hybrid properties — on the model class.
+
+        :raises AttributeError: if the model class has no such attribute.
+        """
+
+        try:
+            return self.attributes[name]
+        except KeyError:
+            return getattr(self.model_class, name)
+
+
+@functools.cache
+def model_metadata(model_class: type[DeclarativeBase]) -> ModelMetadata:
+    """Return the ModelMetadata of model_class, computing it on first use."""
+
+    return ModelMetadata(model_class)
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import contextlib
+import functools
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator, Literal, TypeVar, cast
+
+import more_itertools
+from sqlalchemy.orm import Session
+
+from .base import BaseRepository
+
+__all__ = ['ChunkError', 'ParallelLoadReport', 'WorkerStats', 'parallel_load']
+
+X = TypeVar('X')
+Y = TypeVar('Y')
+
+
+class WorkerStats:
+    """
+    Work done by one worker thread of parallel_load.
+
+    :ivar name: Name of the worker thread.
+    :ivar chunks: Number of chunks committed.
+    :ivar rows: Number of rows committed.
+    :ivar duration: Seconds spent loading chunks, including failed ones.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.chunks = 0
+        self.rows = 0
+        self.duration = 0.0
+
+    def __repr__(self) -> str:
+        return f'<WorkerStats {self.name} chunks={self.chunks} rows={self.rows} duration={self.duration:.3f}>'
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.duration if self.duration else 0.0
+
+
+class ChunkError:
+    """
+    Chunk of parallel_load that was rolled back.
+
+    :ivar index: Position of the chunk in the input, starting at 0.
+    :ivar offset: Position of the chunk's first row in the input.
+    :ivar size: Number of rows in the chunk.
+    :ivar error: Exception raised while building or inserting the chunk.
+    """
+
+    def __init__(self, index: int, offset: int, size: int, error: BaseException):
+        self.index = index
+        self.offset = offset
+        self.size = size
+        self.error = error
+
+    def __repr__(self) -> str:
+        return f'<ChunkError index={self.index} offset={self.offset} size={self.size} error={self.error!r}>'
+
+
+class ParallelLoadReport:
+    """
+    Outcome of parallel_load.
+
+    :ivar rows_inserted: Number of rows committed.
+    :ivar chunks: Number of chunks processed, including failed ones.
+    :ivar errors: Failed chunks in input order.
+    :ivar workers: Per-worker statistics keyed by thread name.
+    :ivar duration: Wall time of the whole load in seconds.
+    """
+
+    def __init__(self) -> None:
+        self.rows_inserted = 0
+        self.chunks = 0
+        self.errors: list[ChunkError] = []
+        self.workers: dict[str, WorkerStats] = {}
+        self.duration = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f'<ParallelLoadReport inserted={self.rows_inserted} chunks={self.chunks} errors={len(self.errors)} '
+            f'workers={len(self.workers)} duration={self.duration:.3f}>'
+        )
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_inserted / self.duration if self.duration else 0.0
+
+
+def parallel_load(
+    repository_factory: Callable[[Session], BaseRepository[Any]],
+    session_factory: Callable[[], Session],
+    data: Iterable[Any],
+    *,
+    workers: int = 4,
+    chunk_size: int | None = None,
+    row_factory: Callable[[Any], dict[str, Any]] | None = None,
+    executor: Literal['thread', 'process'] = 'thread',
+    bulk: bool = True,
+) -> ParallelLoadReport:
+    """
+    Insert rows concurrently, one chunk per transaction, on separate sessions.
+
+    The input is split into chunks like create_batch_from_dicts does. Every chunk is passed to
+    create_batch_from_dicts of a repository on a fresh session from session_factory and committed,
+    on a pool of worker threads. Atomicity is per chunk — a failing chunk is rolled back and
+    reported in ParallelLoadReport.errors while the others are still committed.
+
+    Usage::
+
+        engine = create_engine('sqlite:///data.db', pool_size=8)
+        report = parallel_load(ArticleRepository, sessionmaker(engine), rows, workers=8)
+
+    SQLite serializes writers even in WAL mode, so concurrency there mostly overlaps row
+    construction with inserts; PostgreSQL inserts chunks truly in parallel. Make sure the engine's
+    pool holds at least workers connections.
+
+    :param repository_factory: Callable creating a repository from a session, e.g. the repository class.
+    :param session_factory: Callable returning a new session, e.g. a sessionmaker bound to a shared engine.
+    :param data: Iterable of dicts mapping column names to values, or of raw items if row_factory is given.
+                 It is consumed lazily with at most 2 * workers chunks in flight.
+    :param workers: Number of worker threads, and of processes when executor is 'process'.
+    :param chunk_size: Rows per chunk. Defaults to the repository's BATCH_SIZE.
+    :param row_factory: Callable converting a raw input item to a dict of column values.
+    :param executor: 'thread' to apply row_factory on the worker threads, or 'process' to apply it
+                     on a process pool first, for CPU-heavy row construction. row_factory must be
+                     picklable — a module-level function — in that case.
+    :param bulk: See create_batch_from_dicts.
+    :returns: ParallelLoadReport with row counts, errors and per-worker throughput.
+    """
+
+    chunk_size = chunk_size or getattr(repository_factory, 'BATCH_SIZE', BaseRepository.BATCH_SIZE)
+    report = ParallelLoadReport()
+    lock = threading.Lock()
+
+    def load_chunk(item: tuple[int, int, int, list[Any] | Exception]) -> None:
+        index, offset, size, rows = item
+        start = time.perf_counter()
+        name = threading.current_thread().name
+        error = rows if isinstance(rows, Exception) else None
+        if not isinstance(rows, Exception):
+            try:
+                if row_factory is not None and executor == 'thread':
+                    rows = [row_factory(row) for row in rows]
+                with session_factory() as session:
+                    repository_factory(session).create_batch_from_dicts(rows, bulk, returning='count')
+                    session.commit()
+            except Exception as e:
+                error = e
+
+        with lock:
+            stats = report.workers.setdefault(name, WorkerStats(name))
+            stats.duration += time.perf_counter() - start
+            report.chunks += 1
+            if error is None:
+                stats.chunks += 1
+                stats.rows += size
+                report.rows_inserted += size
+            else:
+                report.errors.append(ChunkError(index, offset, size, error))
+
+    start = time.perf_counter()
+    chunks: Iterator[tuple[int, int, int, list[Any] | Exception]] = _indexed(more_itertools.chunked(data, chunk_size))
+    with contextlib.ExitStack() as stack:
+        if executor == 'process' and row_factory is not None:
+            processes = stack.enter_context(concurrent.futures.ProcessPoolExecutor(workers))
+            chunks = _bounded_map(processes, functools.partial(_build_rows, row_factory), chunks, workers * 2)
+
+        threads = stack.enter_context(
+            concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix='parallel_load')
+        )
+        collections.deque(_bounded_map(threads, load_chunk, chunks, workers * 2), 0)
+
+    report.errors.sort(key=lambda error: error.index)
+    report.duration = time.perf_counter() - start
+    return report
+
+
+def _indexed(chunks: Iterable[list[Any]]) -> Iterator[tuple[int, int, int, list[Any] | Exception]]:
+    """Yield (index, offset of the first row, size, chunk) tuples."""
+
+    offset = 0
+    for index, chunk in enumerate(chunks):
+        yield index, offset, len(chunk), chunk
+        offset += len(chunk)
+
+
+def _build_rows(
+    row_factory: Callable[[Any], dict[str, Any]], item: tuple[int, int, int, list[Any] | Exception]
+) -> tuple[int, int, int, list[Any] | Exception]:
+    """Apply row_factory to a chunk in a worker process, returning the exception instead of raising it."""
+
+    index, offset, size, chunk = item
+    try:
+        return index, offset, size, [row_factory(row) for row in cast(list[Any], chunk)]
+    except Exception as e:
+        return index, offset, size, e
+
+
+def _bounded_map(
+    executor: concurrent.futures.Executor, fn: Callable[[X], Y], items: Iterable[X], window: int
+) -> Iterator[Y]:
+    """Like Executor.map, but consume items lazily with at most window calls in flight."""
+
+    pending: collections.deque[concurrent.futures.Future[Y]] = collections.deque()
+    for item in items:
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(executor.submit(fn, item))
+    while pending:
+        yield pending.popleft().result()
@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import concurrent.futures
+import heapq
+import itertools
+import zlib
+from typing import Any, Callable, Generic, Iterable, Mapping, Sequence, TypeVar, cast
+
+import sqlalchemy as sa
+from sqlalchemy import ColumnElement
+from sqlalchemy.engine.result import result_tuple
+from sqlalchemy.exc import MultipleResultsFound, NoResultFound
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.sql import operators
+
+from .base import BaseRepository, BatchReturning, LoadStrategy
+
+__all__ = ['ShardedRepository']
+
+T = TypeVar('T', bound=DeclarativeBase)
+X = TypeVar('X')
+
+_SORT_KEY = '_shard_sort_key'
+
+# dialects sorting NULLs after all values in ascending order, the others sort them before
+_NULLS_HIGH_DIALECTS = frozenset({'postgresql', 'oracle'})
+
+
+class ShardedRepository(Generic[T]):
+    """
+    Repository of a model whose table is partitioned horizontally across several databases (shards).
+
+    Every shard is served by its own BaseRepository, on its own session. A record lives on the shard
+    that shard_for returns for its shard_key value::
+
+        shards = {name: ArticleRepository(Session(engine)) for name, engine in engines.items()}
+        repository = ShardedRepository(shards, 'group', lambda group: 'eu' if group in EU_GROUPS else 'us')
+
+    create and create_batch write every record to its shard. Reads whose filters pin the shard key —
+    `Article.group == 'de'` or `Article.group.in_(['de', 'fr'])` — only query the shards holding those
+    values, any other read is fanned out to all shards concurrently on a thread pool. find merges the
+    results of the shards in order_by order. Writes to several shards are not atomic — every shard is
+    committed through its own session.
+
+    Use the repositories in shards directly for operations that are not sharded here. Sessions are
+    used from the pool's threads, so SQLite engines need connect_args={'check_same_thread': False}.
+
+    :param shards: Repository of every shard, keyed by shard name.
+    :param shard_key: Name of the model attribute records are sharded by.
+    :param shard_for: Callable returning the shard name of a shard key value. Defaults to a stable
+                      hash of the value over the shard names.
+    :param workers: Size of the thread pool. Defaults to the number of shards.
+    """
+
+    def __init__(
+        self,
+        shards: Mapping[str, BaseRepository[T]],
+        shard_key: str,
+        shard_for: Callable[[Any], str] | None = None,
+        *,
+        workers: int | None = None,
+    ):
+        if not shards:
+            raise ValueError('ShardedRepository needs at least one shard')
+
+        self.shards = dict(shards)
+        self.shard_key = shard_key
+        self.shard_for = shard_for or self._hash_shard
+        self.model_class: type[T] = next(iter(self.shards.values())).model_class
+        self._shard_column = self.shards[next(iter(self.shards))].model_metadata.attribute(shard_key).expression
+        self._executor = concurrent.futures.ThreadPoolExecutor(workers or len(self.shards), thread_name_prefix='shard')
+
+    def __enter__(self) -> ShardedRepository[T]:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut the thread pool down. The shard sessions are left open."""
+
+        self._executor.shutdown()
+
+    def _hash_shard(self, value: Any) -> str:
+        names = sorted(self.shards)
+        return names[zlib.crc32(str(value).encode()) % len(names)]
+
+    def shard_of(self, value: Any) -> str:
+        """
+        Return the name of the shard holding records whose shard key is value.
+
+        :raises KeyError: if shard_for returns an unknown shard name.
+        """
+
+        name = self.shard_for(value)
+        if name not in self.shards:
+            raise KeyError(f'shard_for returned unknown shard {name!r}')
+        return name
+
+    def _instance_shard(self, instance: T) -> str:
+        value = getattr(instance, self.shard_key)
+        if value is None:
+            raise ValueError(f'{self.model_class.__name__} has no value for shard key {self.shard_key!r}')
+        return self.shard_of(value)
+
+    def _target_shards(self, where: Iterable[ColumnElement]) -> list[str]:
+        """
+        Return the shards that can hold records matching where, in shard order.
+
+        Equality and IN comparisons of the shard key with literal values narrow the shards down,
+        any other filter matches all shards.
+        """
+
+        names = set(self.shards)
+        for clause in where:
+            if isinstance(clause, sa.BooleanClauseList) and clause.operator is operators.and_:
+                names &= set(self._target_shards(clause.clauses))
+            elif (
+                isinstance(clause, sa.BinaryExpression)
+                and clause.operator in (operators.eq, operators.in_op)
+                and clause.left.compare(self._shard_column)
+                and isinstance(clause.right, sa.BindParameter)
+            ):
+                value = clause.right.effective_value
+                values = cast(list[Any], value) if clause.operator is operators.in_op else [value]
+                names &= {self.shard_of(item) for item in values}
+        return [name for name in self.shards if name in names]
+
+    def _fan_out(self, names: Sequence[str], fn: Callable[[BaseRepository[T]], X]) -> list[X]:
+        """Call fn with the repository of every shard in names, concurrently if there are several."""
+
+        if len(names) == 1:
+            return [fn(self.shards[names[0]])]
+        return list(self._executor.map(lambda name: fn(self.shards[name]), names))
+
+    # write methods
+
+    def create(self, **params: Any) -> T:
+        """
+        Create and flush a new model instance on the shard of its shard key.
+
+        :param params: Column values passed as keyword arguments to MODEL_CLASS.
+        :returns: The newly created and flushed instance.
+        :raises ValueError: if params has no value for the shard key.
+        """
+
+        if params.get(self.shard_key) is None:
+            raise ValueError(f'{self.model_class.__name__} has no value for shard key {self.shard_key!r}')
+        return self.shards[self.shard_of(params[self.shard_key])].create(**params)
+
+    def create_batch(
+        self, instances: Iterable[T], *, expunge: bool = False, returning: BatchReturning = 'instances'
+    ) -> list[T] | list[Any] | int:
+        """
+        Add and flush pre-constructed model instances, every one on the shard of its shard key.
+
+        The shards are written concurrently, each with one create_batch call. A failing shard
+        rolls its own batch back only.
+
+        :param instances: Iterable of MODEL_CLASS instances to persist.
+        :param expunge: See BaseRepository.create_batch.
+        :param returning: See BaseRepository.create_batch. Instances and keys are returned in input order.
+        :returns: List of persisted instances, list of primary keys, or the number of inserted records.
+        :raises ValueError: if any instance has no value for the shard key.
+        """
+
+        groups: dict[str, list[tuple[int, T]]] = {}
+        for index, instance in enumerate(instances):
+            groups.setdefault(self._instance_shard(instance), []).append((index, instance))
+
+        names = list(groups)
+        results = list(
+            self._executor.map(
+                lambda name: self.shards[name].create_batch(
+                    [instance for _, instance in groups[name]], expunge=expunge, returning=returning
+                ),
+                names,
+            )
+        )
+        if returning == 'count':
+            return sum(cast(int, result) for result in results)
+
+        ordered: dict[int, Any] = {}
+        for name, result in zip(names, results, strict=True):
+            ordered.update(zip((index for index, _ in groups[name]), cast(list[Any], result), strict=True))
+        return [ordered[index] for index in range(len(ordered))]
+
+    # read methods
+
+    def get(
+        self,
+        *where: ColumnElement,
+        joins: list[Any] | None = None,
+        joined_loads: tuple[Any, ...] | None = None,
+        load_strategy: LoadStrategy | None = None,
+        select: tuple[Any, ...] | None = None,
+        row_type: Callable[..., Any] | None = None,
+    ) -> Any:
+        """
+        Fetch exactly one record matching the given filters. See BaseRepository.get for parameters.
+
+        :raises NoResultFound: if no record matches.
+        :raises MultipleResultsFound: if more than one record matches, on one shard or across shards.
+        """
+
+        result = self.get_or_none(
+            *where,
+            joins=joins,
+            joined_loads=joined_loads,
+            load_strategy=load_strategy,
+            select=select,
+            row_type=row_type,
+        )
+        if result is None:
+            raise NoResultFound('No row was found when one was required')
+        return result
+
+    def get_or_none(
+        self,
+        *where: ColumnElement,
+        joins: list[Any] | None = None,
+        joined_loads: tuple[Any, ...] | None = None,
+        load_strategy: LoadStrategy | None = None,
+        select: tuple[Any, ...] | None = None,
+        row_type: Callable[..., Any] | None = None,
+    ) -> Any:
+        """
+        Fetch one record matching the given filters, or None. See BaseRepository.get for parameters.
+
+        :raises MultipleResultsFound: if more than one record matches, on one shard or across shards.
+        """
+
+        options: dict[str, Any] = {
+            'joins': joins,
+            'joined_loads': joined_loads,
+            'load_strategy': load_strategy,
+            'select': select,
+            'row_type': row_type,
+        }
+        results = self._fan_out(
+            self._target_shards(where), lambda repository: repository.get_or_none(*where, **options)
+        )
+        found = [result for result in results if result is not None]
+        if len(found) > 1:
+            raise MultipleResultsFound('Multiple rows were found when one or none was required')
+        return found[0] if found else None
+
+    def find(
+        self,
+        *where: ColumnElement,
+        joins: list[Any] | None = None,
+        order_by: ColumnElement | None = None,
+        joined_loads: tuple[Any, ...] | None = None,
+        load_strategy: LoadStrategy | None = None,
+        select: tuple[Any, ...] | None = None,
+        row_type: Callable[..., Any] | None = None,
+    ) -> Sequence[Any]:
+        """
+        Fetch all records matching the given filters from their shards. See BaseRepository.find for parameters.
+
+        With order_by, every shard returns its records sorted and they are combined with a k-way
+        merge, so the result is ordered as a single query would be, NULLs included. The merge compares
+        order_by values in Python, so order_by must be a column whose database ordering matches Python's:
+        numbers, dates and times, booleans, or strings with a binary collation — SQLite's default, or
+        COLLATE "C" on PostgreSQL. Strings under a linguistic collation are merged out of order.
+        Without order_by the records are returned shard by shard.
+        """
+
+        names = self._target_shards(where)
+        options: dict[str, Any] = {
+            'joins': joins,
+            'order_by': order_by,
+            'joined_loads': joined_loads,
+            'load_strategy': load_strategy,
+            'select': select,
+        }
+        if order_by is None or len(names) == 1:
+            results = self._fan_out(names, lambda repository: repository.find(*where, **options, row_type=row_type))
+            return list(itertools.chain.from_iterable(results))
+
+        sort = order_by
+        descending = False
+        if isinstance(sort, sa.UnaryExpression) and sort.modifier in (operators.asc_op, operators.desc_op):
+            descending = sort.modifier is operators.desc_op
+            sort = sort.element
+
+        def find_sorted(repository: BaseRepository[T]) -> Sequence[sa.Row]:
+            stmt = repository.get_query(*where, **options).add_columns(sort.label(_SORT_KEY))
+            result = repository._execute(stmt)
+            return result.all() if select else result.unique().all()
+
+        nulls_high = self.shards[names[0]].session.get_bind().dialect.name in _NULLS_HIGH_DIALECTS
+
+        def merge_key(row: sa.Row) -> tuple[Any, ...]:
+            # NULLs compare to nothing in Python, so they are ranked apart from the values like the database does
+            if row[-1] is None:
+                return (2,) if nulls_high else (0,)
+            return 1, row[-1]
+
+        merged = heapq.merge(*self._fan_out(names, find_sorted), key=merge_key, reverse=descending)
+        if not select:
+            return [row[0] for row in merged]
+
+        rows = list(merged)
+        if not rows:
+            return []
+        make_row = result_tuple(list(rows[0]._fields[:-1]))
+        convert = self.shards[names[0]]._convert_row
+        return [convert(make_row(tuple(row)[:-1]), row_type) for row in rows]
+
+    def count(self, *where: ColumnElement, joins: list[Any] | None = None) -> int:
+        """Count records matching the given filters on all their shards. See BaseRepository.count."""
+
+        return sum(self._fan_out(self._target_shards(where), lambda repository: repository.count(*where, joins=joins)))
+
+    def exists(self, *where: ColumnElement, joins: list[Any] | None = None) -> bool:
+        """Check whether any shard has a record matching the given filters. See BaseRepository.exists."""
+
+        return any(self._fan_out(self._target_shards(where), lambda repository: repository.exists(*where, joins=joins)))
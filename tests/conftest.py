@@ -1,13 +1,17 @@
 import contextlib
 
 import pytest
+import pytest_asyncio
 from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from .models import Base
-from .repositories import ArticleRepository
+from .repositories import ArticleRepository, AsyncArticleRepository
 
 DB_URL = 'sqlite:///./test.db'
+ASYNC_DB_URL = 'sqlite+aiosqlite://'
 
 Session = scoped_session(sessionmaker())
 
@@ -46,6 +50,23 @@ def repository(db_session):
     return ArticleRepository(db_session)
 
 
+@pytest_asyncio.fixture()
+async def async_db_session():
+    engine = create_async_engine(ASYNC_DB_URL, poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as ses:
+        yield ses
+
+    await engine.dispose()
+
+
+@pytest.fixture()
+def async_repository(async_db_session):
+    return AsyncArticleRepository(async_db_session)
+
+
 @contextlib.contextmanager
 def count_queries(conn):
     queries = []
@@ -43,3 +43,21 @@ class ArticleToCategory(Base):
 
     article: Mapped[Article] = relationship()
     category: Mapped[Category] = relationship()
+
+
+class Post(Base):
+    __tablename__ = 'posts'
+
+    title: Mapped[str]
+
+    visible_notes: Mapped[list[Note]] = relationship(
+        primaryjoin='and_(Post.id == Note.post_id, Note.hidden == False)', order_by='Note.id', viewonly=True
+    )
+
+
+class Note(Base):
+    __tablename__ = 'notes'
+
+    content: Mapped[str]
+    hidden: Mapped[bool] = mapped_column(default=False)
+    post_id: Mapped[int] = mapped_column(ForeignKey('posts.id'))
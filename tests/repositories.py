@@ -1,11 +1,22 @@
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from sa_repository import BaseRepository
+from sa_repository import AsyncBaseRepository, BaseRepository
 
 from .models import Article, Comment
 
 
 class ArticleRepository(BaseRepository[Article]):
+    QUERIES = {
+        'by_group': lambda repository: repository.get_query(
+            Article.group == sa.bindparam('group'), order_by=Article.id, joined_loads=(Article.comments,)
+        ),
+        'by_title': sa.select(Article).where(Article.title == sa.bindparam('title')),
+        'titles': sa.select(Article.title).order_by(Article.title),
+        'groups': sa.select(Article.group).where(Article.group == sa.bindparam('group')),
+    }
+
     def __init__(self, session: Session):
         super().__init__(session, Article)
 
@@ -13,3 +24,8 @@ class ArticleRepository(BaseRepository[Article]):
 class CommentRepository(BaseRepository[Comment]):
     def __init__(self, session: Session):
         super().__init__(session, Comment)
+
+
+class AsyncArticleRepository(AsyncBaseRepository[Article]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, Article)
@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy import exc
+
+from .conftest import count_queries
+from .models import Article, Comment
+
+
+@pytest.mark.read
+class TestAsyncReadMethods:
+    async def test_get(self, async_repository):
+        article = await async_repository.create(title='title-#1')
+
+        result = await async_repository.get(Article.id == article.id)
+        assert result is article
+
+    async def test_get__not_found(self, async_repository):
+        with pytest.raises(exc.NoResultFound):
+            await async_repository.get(Article.id == 999)
+
+    async def test_get_or_none(self, async_repository):
+        article = await async_repository.create(title='title-#1')
+
+        assert await async_repository.get_or_none(Article.title == 'title-#1') is article
+        assert await async_repository.get_or_none(Article.title == 'missing') is None
+
+    async def test_find(self, async_repository):
+        await async_repository.create_batch_from_dicts([{'title': f'title-#{i}', 'group': 'async'} for i in range(5)])
+
+        result = await async_repository.find(Article.group == 'async', order_by=Article.title.desc())
+        assert [article.title for article in result] == [f'title-#{i}' for i in reversed(range(5))]
+
+    async def test_find__joined_loads(self, async_repository, async_db_session):
+        article = await async_repository.create(title='title-#1', comments=[Comment(content='a'), Comment(content='b')])
+        async_db_session.expunge_all()
+
+        result = await async_repository.find(Article.id == article.id, joined_loads=(Article.comments,))
+        assert len(result[0].comments) == 2
+
+    @pytest.mark.parametrize('page_size', (1, 2, 10))
+    async def test_iter_find(self, async_repository, async_db_session, page_size):
+        await async_repository.create_batch_from_dicts([{'title': f'title-#{i}', 'group': 'async'} for i in range(5)])
+
+        connection = await async_db_session.connection()
+        with count_queries(connection.sync_connection) as queries:
+            result = [
+                article async for article in async_repository.iter_find(order_by=Article.title, page_size=page_size)
+            ]
+
+        assert [article.title for article in result] == [f'title-#{i}' for i in range(5)]
+        assert len(queries) == 5 // page_size + 1
+
+
+@pytest.mark.write
+class TestAsyncWriteMethods:
+    async def test_create(self, async_repository):
+        article = await async_repository.create(title='title-#1')
+        assert article.id is not None
+
+    async def test_create_batch__type_error(self, async_repository):
+        with pytest.raises(ValueError, match='Not all models are instance of class Article'):
+            await async_repository.create_batch([Article(title='ok'), Comment(content='wrong')])
+
+    async def test_create_batch__rollback(self, async_repository):
+        await async_repository.create(title='duplicated')
+
+        with pytest.raises(exc.IntegrityError):
+            await async_repository.create_batch([Article(title='fresh'), Article(title='duplicated')])
+        assert await async_repository.find(Article.title == 'fresh') == []
+
+    async def test_get_or_create(self, async_repository):
+        obj, created = await async_repository.get_or_create(title='New title')
+        assert created
+
+        same, created = await async_repository.get_or_create(title='New title')
+        assert not created
+        assert same is obj
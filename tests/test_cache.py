@@ -0,0 +1,290 @@
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from sa_repository import LRUCache
+from sa_repository.base import _record_flushed_tables
+
+from .conftest import count_queries
+from .factories import ArticleFactory, CategoryFactory
+from .models import Article, Base, Comment
+from .repositories import ArticleRepository, CommentRepository
+
+
+@pytest.fixture()
+def cache():
+    return LRUCache()
+
+
+@pytest.fixture()
+def cached_repository_class(cache):
+    return type('CachedArticleRepository', (ArticleRepository,), {'CACHE': cache})
+
+
+@pytest.fixture()
+def cached_repository(db_session, cached_repository_class):
+    return cached_repository_class(db_session)
+
+
+class TestLRUCache:
+    def test_get_set(self, cache):
+        cache.set('key', b'value', tags={'articles'})
+        assert cache.get('key') == b'value'
+        assert cache.get('missing') is None
+
+    def test_eviction(self):
+        cache = LRUCache(maxsize=2)
+        cache.set('a', b'1', tags=())
+        cache.set('b', b'2', tags=())
+        cache.get('a')
+        cache.set('c', b'3', tags=())
+
+        assert cache.get('b') is None
+        assert cache.get('a') == b'1'
+        assert cache.get('c') == b'3'
+        assert cache.stats.evictions == 1
+
+    def test_ttl(self, monkeypatch):
+        now = 100.0
+        monkeypatch.setattr('sa_repository.cache.time.monotonic', lambda: now)
+        cache = LRUCache(ttl=10)
+        cache.set('key', b'value', tags=())
+
+        now = 109.0
+        assert cache.get('key') == b'value'
+        now = 110.0
+        assert cache.get('key') is None
+        assert len(cache) == 0
+
+    def test_invalidate(self, cache):
+        cache.set('a', b'1', tags={'articles'})
+        cache.set('b', b'2', tags={'articles', 'comments'})
+        cache.set('c', b'3', tags={'categories'})
+
+        cache.invalidate({'comments'})
+
+        assert cache.get('a') == b'1'
+        assert cache.get('b') is None
+        assert cache.get('c') == b'3'
+        assert cache.stats.invalidations == 1
+
+
+@pytest.fixture()
+def committed_session(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "cache.db"}')
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture()
+def committed_repository(committed_session, cached_repository_class):
+    return cached_repository_class(committed_session)
+
+
+def commit_articles(session, count=1):
+    articles = [Article(title=f'committed #{i}') for i in range(count)]
+    session.add_all(articles)
+    session.commit()
+    return articles
+
+
+@pytest.mark.read
+class TestCachedReadMethods:
+    @pytest.mark.parametrize('func', ('get', 'get_or_none', 'find'))
+    def test_hit(self, committed_repository, committed_session, cache, func):
+        (article,) = commit_articles(committed_session)
+        function = getattr(committed_repository, func)
+
+        function(Article.id == article.id)
+        with count_queries(committed_session.connection()) as queries:
+            result = function(Article.id == article.id)
+
+        assert queries == []
+        assert (result[0] if func == 'find' else result) is article
+        # committing the flushed article invalidated its table once
+        assert cache.stats.as_dict() == {'hits': 1, 'misses': 1, 'invalidations': 1, 'evictions': 0}
+
+    def test_bound_parameters(self, committed_repository, committed_session, cache):
+        first, second = commit_articles(committed_session, 2)
+
+        assert committed_repository.get(Article.id == first.id) is first
+        assert committed_repository.get(Article.id == second.id) is second
+        assert cache.stats.misses == 2
+
+    def test_named_query_parameters(self, committed_repository, committed_session, cache):
+        first, second = commit_articles(committed_session, 2)
+
+        assert committed_repository.get_named('by_title', title=first.title) is first
+        assert committed_repository.get_named('by_title', title=second.title) is second
+        assert committed_repository.get_named('by_title', title=first.title) is first
+        assert (cache.stats.misses, cache.stats.hits) == (2, 1)
+
+    def test_other_session(self, committed_repository, committed_session):
+        (article,) = commit_articles(committed_session)
+        committed_repository.get(Article.id == article.id)
+
+        with Session(committed_session.get_bind()) as other_session:
+            repository = type(committed_repository)(other_session)
+            with count_queries(other_session.connection()) as queries:
+                result = repository.get(Article.id == article.id)
+
+            assert queries == []
+            assert result is not article
+            assert result in other_session
+            assert result.title == article.title
+
+    def test_uncommitted_writes_are_not_cached(self, committed_repository, committed_session, cached_repository_class):
+        committed_repository.create(title='phantom')
+        assert committed_repository.get_or_none(Article.title == 'phantom') is not None
+        committed_session.rollback()
+
+        with Session(committed_session.get_bind()) as other_session:
+            repository = cached_repository_class(other_session)
+            assert repository.get_or_none(Article.title == 'phantom') is None
+
+    def test_flushed_writes_are_not_cached(self, committed_repository, committed_session, cache):
+        committed_session.add(Article(title='flushed'))
+        committed_session.flush()
+
+        assert committed_repository.get_or_none(Article.title == 'flushed') is not None
+        assert len(cache) == 0
+
+    def test_pending_writes_are_not_cached(self, committed_repository, committed_session, cache):
+        committed_session.add(Article(title='phantom'))
+        assert committed_repository.get_or_none(Article.title == 'phantom') is not None
+        assert len(cache) == 0
+        committed_session.rollback()
+
+        assert committed_repository.get_or_none(Article.title == 'phantom') is None
+
+    def test_commit_of_flushed_writes_invalidates(
+        self, committed_repository, committed_session, cached_repository_class
+    ):
+        with Session(committed_session.get_bind()) as other_session:
+            repository = cached_repository_class(other_session)
+            assert repository.find() == []
+
+            committed_session.add(Article(title='autoflushed'))
+            committed_repository.find()
+            committed_session.commit()
+            other_session.commit()
+            assert [article.title for article in repository.find()] == ['autoflushed']
+
+    def test_listeners_need_cache(self, db_session):
+        ArticleRepository(db_session).get_or_none(Article.id == 1)
+
+        assert not sa.event.contains(db_session, 'after_flush', _record_flushed_tables)
+
+    def test_commit_invalidates(self, committed_repository, committed_session, cached_repository_class):
+        committed_repository.create(title='new')
+        with Session(committed_session.get_bind()) as other_session:
+            repository = cached_repository_class(other_session)
+            assert repository.get_or_none(Article.title == 'new') is None
+
+            committed_session.commit()
+            assert repository.get_or_none(Article.title == 'new') is not None
+
+    def test_pending_changes_are_kept(self, cached_repository):
+        article = ArticleFactory(title='original')
+        cached_repository.get(Article.id == article.id)
+        article.title = 'changed'
+
+        assert cached_repository.get(Article.id == article.id).title == 'changed'
+
+    def test_joined_loads(self, committed_repository, committed_session):
+        (article,) = commit_articles(committed_session)
+        article.comments = [Comment(content='first'), Comment(content='second')]
+        committed_session.commit()
+        committed_repository.find(Article.id == article.id, joined_loads=(Article.comments,))
+        committed_session.expunge_all()
+
+        with count_queries(committed_session.connection()) as queries:
+            result = committed_repository.find(Article.id == article.id, joined_loads=(Article.comments,))
+            assert len(result[0].comments) == 2
+        assert queries == []
+
+    def test_loader_options(self, committed_repository, committed_session, cache):
+        (article,) = commit_articles(committed_session)
+        article.comments = [Comment(content='first'), Comment(content='second')]
+        committed_session.commit()
+
+        committed_repository.find(Article.id == article.id, joined_loads=(Article.comments,), load_strategy='raise')
+        committed_session.expunge_all()
+        assert len(committed_repository.find(Article.id == article.id)[0].comments) == 2
+
+        committed_session.expunge_all()
+        committed_repository.find(Article.id == article.id, joined_loads=(Article.comments,), load_strategy='selectin')
+        committed_session.expunge_all()
+        with count_queries(committed_session.connection()) as queries:
+            result = committed_repository.find(
+                Article.id == article.id, joined_loads=(Article.comments,), load_strategy='selectin'
+            )
+            assert len(result[0].comments) == 2
+        assert queries == []
+        assert cache.stats.misses == 3
+
+
+@pytest.mark.write
+class TestCacheInvalidation:
+    @pytest.mark.parametrize(
+        'write',
+        (
+            lambda repository: repository.create(title='new', group='cached'),
+            lambda repository: repository.create_batch([Article(title='new', group='cached')]),
+            lambda repository: repository.create_batch_from_dicts([{'title': 'new', 'group': 'cached'}]),
+            lambda repository: repository.create_batch_from_dicts([{'title': 'new', 'group': 'cached'}], bulk=True),
+            lambda repository: repository.insert_batch_from_dicts([{'title': 'new', 'group': 'cached'}]),
+            lambda repository: repository.upsert_batch(
+                [{'title': 'new', 'group': 'cached'}], conflict_columns=['title']
+            ),
+            lambda repository: repository.get_or_create_many([{'title': 'new', 'group': 'cached'}]),
+        ),
+    )
+    def test_write_invalidates(self, cached_repository, write):
+        assert cached_repository.find(Article.group == 'cached') == []
+
+        write(cached_repository)
+
+        assert len(cached_repository.find(Article.group == 'cached')) == 1
+
+    @pytest.mark.parametrize(
+        'write',
+        (
+            lambda repository, article: repository.update_where(Article.id == article.id, group='cached'),
+            lambda repository, article: repository.update_batch_from_dicts([{'id': article.id, 'group': 'cached'}]),
+        ),
+    )
+    def test_update_invalidates(self, cached_repository, write):
+        article = ArticleFactory(group='old')
+        assert cached_repository.find(Article.group == 'cached') == []
+
+        write(cached_repository, article)
+
+        assert cached_repository.find(Article.group == 'cached') == [article]
+
+    def test_delete_invalidates(self, cached_repository):
+        ArticleFactory(group='cached')
+        assert len(cached_repository.find(Article.group == 'cached')) == 1
+
+        cached_repository.delete_where(Article.group == 'cached')
+
+        assert cached_repository.find(Article.group == 'cached') == []
+
+    def test_related_write_invalidates_joined_query(self, cached_repository, db_session, cache):
+        article = ArticleFactory()
+        cached_repository.find(Comment.content == 'joined', joins=[Article.comments])
+
+        comment_repository = CommentRepository(db_session)
+        comment_repository.CACHE = cache
+        comment_repository.create(content='joined', article=article)
+
+        assert cached_repository.find(Comment.content == 'joined', joins=[Article.comments]) == [article]
+
+    def test_m2m_write_invalidates(self, cached_repository, cache):
+        cache.set('key', b'value', tags={'article_to_category'})
+
+        cached_repository.create(title='m2m', categories=[CategoryFactory()])
+        assert cache.get('key') is None
@@ -0,0 +1,84 @@
+import array
+import math
+
+import pytest
+
+from sa_repository import columnar
+from sa_repository.columnar import ColumnBuilder
+
+
+class TestColumnBuilder:
+    @pytest.mark.parametrize(
+        'python_type, values, expected',
+        (
+            (int, [1, 2, 3], array.array('q', [1, 2, 3])),
+            (bool, [True, False], array.array('b', [1, 0])),
+            (str, ['a', None], ['a', None]),
+            (None, [{'a': 1}], [{'a': 1}]),
+        ),
+    )
+    def test_array(self, python_type, values, expected):
+        builder = ColumnBuilder(python_type, 'array')
+        builder.extend(values[:1])
+        builder.extend(values[1:])
+
+        assert builder.build() == expected
+
+    def test_array__nulls(self):
+        floats = ColumnBuilder(float, 'array')
+        floats.extend([1.5, None])
+        assert floats.build()[0] == 1.5
+        assert math.isnan(floats.build()[1])
+
+        ints = ColumnBuilder(int, 'array')
+        ints.extend([1, 2])
+        ints.extend([None, 3])
+        assert ints.build() == [1, 2, None, 3]
+
+    def test_list(self):
+        builder = ColumnBuilder(int, 'list')
+        builder.extend((1, 2))
+
+        assert builder.build() == [1, 2]
+
+    def test_auto__without_numpy(self, monkeypatch):
+        monkeypatch.setattr(columnar, 'numpy', None)
+
+        assert ColumnBuilder(int).backend == 'array'
+        with pytest.raises(ImportError, match='NumPy is required'):
+            ColumnBuilder(int, 'numpy')
+
+    def test_numpy(self):
+        numpy = pytest.importorskip('numpy')
+
+        ints = ColumnBuilder(int, 'numpy')
+        ints.extend([1, 2])
+        ints.extend([3])
+        assert ints.build().dtype == numpy.int64
+        assert ints.build().tolist() == [1, 2, 3]
+
+        nullable = ColumnBuilder(int, 'numpy')
+        nullable.extend([1])
+        nullable.extend([None])
+        assert nullable.build().dtype == object
+        assert nullable.build().tolist() == [1, None]
+
+        assert ColumnBuilder(str, 'numpy').build().dtype == object
+
+    def test_numpy__preallocated(self):
+        pytest.importorskip('numpy')
+
+        exact = ColumnBuilder(int, 'numpy', size=3)
+        allocated = exact._data
+        exact.extend([1, 2])
+        exact.extend([3])
+        assert exact.build() is allocated
+        assert exact.build().tolist() == [1, 2, 3]
+
+        grown = ColumnBuilder(float, 'numpy', size=1)
+        grown.extend([1.5, 2.5, 3.5])
+        assert grown.build().tolist() == [1.5, 2.5, 3.5]
+
+        trimmed = ColumnBuilder(None, 'numpy', size=5)
+        trimmed.extend([[1], {'a': 2}])
+        assert trimmed.build().tolist() == [[1], {'a': 2}]
@@ -0,0 +1,105 @@
+import pytest
+
+from sa_repository import Instrumentation, MetricsCollector
+
+from .factories import ArticleFactory, CommentFactory
+from .models import Article
+from .repositories import ArticleRepository
+
+
+@pytest.fixture()
+def records():
+    return []
+
+
+@pytest.fixture()
+def instrumented_repository(db_session, records):
+    repository = ArticleRepository(db_session)
+    repository.INSTRUMENTATION = Instrumentation(sink=records.append, n_plus_one_threshold=3)
+    return repository
+
+
+class TestInstrumentation:
+    def test_disabled(self, repository, records):
+        ArticleFactory()
+        repository.find()
+        assert records == []
+
+    def test_find(self, instrumented_repository, records):
+        ArticleFactory.create_batch(3, group='instrumented')
+
+        instrumented_repository.find(Article.group == 'instrumented')
+
+        assert len(records) == 1
+        stats = records[0]
+        assert stats.name == 'ArticleRepository.find'
+        assert len(stats.statements) == 1
+        assert stats.rows == 3
+        assert stats.savepoints == 0
+        assert stats.duration > 0
+        assert stats.n_plus_one == []
+
+    @pytest.mark.parametrize('func, rows', (('get', 1), ('get_or_none', 1), ('count', None), ('exists', None)))
+    def test_rows(self, instrumented_repository, records, func, rows):
+        article = ArticleFactory()
+
+        getattr(instrumented_repository, func)(Article.id == article.id)
+        assert records[0].rows == rows
+
+    def test_get_or_none__not_found(self, instrumented_repository, records):
+        instrumented_repository.get_or_none(Article.id == 999999)
+        assert records[0].rows == 0
+
+    def test_create_batch(self, instrumented_repository, records):
+        instrumented_repository.create_batch([Article(title='instrumented #1'), Article(title='instrumented #2')])
+
+        assert [stats.name for stats in records] == ['ArticleRepository.create_batch']
+        assert records[0].savepoints == 1
+        assert records[0].rows == 2
+
+    def test_nested_calls(self, instrumented_repository, records):
+        instrumented_repository.get_or_create(title='instrumented')
+
+        assert [stats.name for stats in records] == ['ArticleRepository.get_or_create']
+        assert len(records[0].statements) == 2
+        assert records[0].rows == 1
+
+    def test_iter_find(self, instrumented_repository, records):
+        ArticleFactory.create_batch(5, group='instrumented')
+
+        result = list(instrumented_repository.iter_find(Article.group == 'instrumented', page_size=2))
+
+        assert len(result) == 5
+        assert [stats.name for stats in records] == ['ArticleRepository.iter_find']
+        assert records[0].rows == 5
+        assert len(records[0].statements) == 3
+
+    def test_n_plus_one(self, instrumented_repository, records, db_session):
+        for article in ArticleFactory.create_batch(3, group='instrumented'):
+            CommentFactory(article=article)
+        db_session.expunge_all()
+
+        instrumentation = instrumented_repository.INSTRUMENTATION
+        with instrumentation.operation(db_session, 'list_articles') as stats:
+            for article in instrumented_repository.find(Article.group == 'instrumented'):
+                assert len(article.comments) == 1
+
+        assert [record.name for record in records] == ['ArticleRepository.find', 'list_articles']
+        assert len(stats.statements) == 4
+        assert len(stats.n_plus_one) == 1
+        assert stats.n_plus_one[0][1] == 3
+
+    def test_metrics_collector(self, db_session):
+        metrics = MetricsCollector()
+        repository = ArticleRepository(db_session)
+        repository.INSTRUMENTATION = Instrumentation(sink=metrics)
+
+        repository.create_batch([Article(title='instrumented #1')])
+        repository.create_batch([Article(title='instrumented #2')])
+        repository.find(Article.title.like('instrumented%'))
+
+        result = metrics.as_dict()
+        assert result['ArticleRepository.create_batch']['calls'] == 2
+        assert result['ArticleRepository.create_batch']['savepoints'] == 2
+        assert result['ArticleRepository.find']['rows'] == 2
+        assert result['ArticleRepository.find']['statements'] == 1
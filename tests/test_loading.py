@@ -0,0 +1,94 @@
+import io
+import json
+
+import pytest
+
+from sa_repository.loading import RowCoercer, read_records
+
+from .factories import ArticleFactory
+from .models import Article, Comment
+from .repositories import CommentRepository
+
+
+class TestReadRecords:
+    def test_csv(self):
+        source = io.StringIO('title,group\nfirst,python\nsecond,\n')
+
+        assert list(read_records(source, 'csv')) == [
+            (2, {'title': 'first', 'group': 'python'}),
+            (3, {'title': 'second', 'group': ''}),
+        ]
+
+    def test_ndjson(self, tmp_path):
+        path = tmp_path / 'articles.ndjson'
+        path.write_text('{"title": "first"}\n\nnot json\n[1]\n')
+
+        records = list(read_records(path))
+        assert records[0] == (1, {'title': 'first'})
+        assert [line for line, _ in records] == [1, 3, 4]
+        assert all('__error__' in record for _, record in records[1:])
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError, match='Cannot infer the format'):
+            list(read_records(io.StringIO('')))
+
+
+class TestRowCoercer:
+    def test_coerce(self):
+        coerce = RowCoercer(Comment)
+        assert coerce({'content': 'text', 'article_id': '12'}) == {'content': 'text', 'article_id': 12}
+        assert coerce({'content': '', 'article_id': 12}) == {'content': None, 'article_id': 12}
+
+    @pytest.mark.parametrize(
+        'record, error',
+        (
+            ({'article_id': 'twelve'}, "Invalid value 'twelve' for column 'article_id'"),
+            ({'article_id': 1.5}, "Invalid value 1.5 for column 'article_id'"),
+            ({'unknown': 'value'}, "Unknown column 'unknown'"),
+        ),
+    )
+    def test_coerce__error(self, record, error):
+        with pytest.raises(ValueError, match=error):
+            RowCoercer(Comment)(record)
+
+
+class TestLoadFile:
+    def test_csv(self, repository):
+        source = io.StringIO('title,group\n' + ''.join(f'Article #{i},csv\n' for i in range(5)))
+        reports = []
+        repository.BATCH_SIZE = 2
+
+        report = repository.load_file(source, 'csv', on_progress=lambda report: reports.append(report.rows_read))
+
+        assert (report.rows_read, report.rows_inserted, report.rows_rejected, report.chunks) == (5, 5, 0, 3)
+        assert reports == [2, 4, 5]
+        assert report.rows_per_second > 0
+        assert repository.count(Article.group == 'csv') == 5
+
+    def test_ndjson__coercion(self, db_session):
+        article = ArticleFactory()
+        repository = CommentRepository(db_session)
+        source = io.StringIO(
+            f'{{"content": "first", "article_id": "{article.id}"}}\n{{"content": "second", "article_id": "x"}}\n'
+        )
+
+        report = repository.load_file(source, 'ndjson')
+
+        assert (report.rows_inserted, report.rows_rejected) == (1, 1)
+        assert report.rejected[0].line == 2
+        assert 'article_id' in report.rejected[0].error
+        assert [comment.content for comment in article.comments] == ['first']
+
+    def test_quarantine(self, repository, tmp_path):
+        ArticleFactory(title='duplicated')
+        source = tmp_path / 'articles.csv'
+        source.write_text('title,group\nfresh #1,quarantine\nduplicated,quarantine\nfresh #2,quarantine\n')
+        quarantine = tmp_path / 'rejected.ndjson'
+
+        report = repository.load_file(source, quarantine=quarantine)
+
+        assert (report.rows_inserted, report.rows_rejected, report.rejected) == (2, 1, [])
+        rejected = [json.loads(line) for line in quarantine.read_text().splitlines()]
+        assert [(item['line'], item['record']['title']) for item in rejected] == [(3, 'duplicated')]
+        assert 'UNIQUE' in rejected[0]['error']
+        assert repository.count(Article.group == 'quarantine') == 2
@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+
+from sa_repository import parallel_load
+
+from .models import Article, Base
+from .repositories import ArticleRepository
+
+
+def article_row(i):
+    if i == 13:
+        raise ValueError('bad row')
+    return {'title': f'Article #{i}', 'group': 'parallel'}
+
+
+@pytest.fixture()
+def wal_session_factory(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "parallel.db"}', connect_args={'timeout': 30})
+
+    @event.listens_for(engine, 'connect')
+    def set_wal(dbapi_connection, connection_record):
+        dbapi_connection.execute('PRAGMA journal_mode=WAL')
+
+    Base.metadata.create_all(engine)
+    yield sessionmaker(engine)
+    engine.dispose()
+
+
+def count_articles(session_factory):
+    with session_factory() as session:
+        return session.scalar(select(func.count()).select_from(Article))
+
+
+class TestParallelLoad:
+    def test_load(self, wal_session_factory):
+        rows = ({'title': f'Article #{i}', 'group': 'parallel'} for i in range(100))
+
+        report = parallel_load(ArticleRepository, wal_session_factory, rows, workers=4, chunk_size=10)
+
+        assert (report.rows_inserted, report.chunks, report.errors) == (100, 10, [])
+        assert sum(stats.rows for stats in report.workers.values()) == 100
+        assert all(stats.rows_per_second > 0 for stats in report.workers.values() if stats.rows)
+        assert count_articles(wal_session_factory) == 100
+
+    def test_errors_are_per_chunk(self, wal_session_factory):
+        rows = [{'title': f'Article #{i}'} for i in range(30)]
+        rows[25] = rows[24]
+
+        report = parallel_load(ArticleRepository, wal_session_factory, rows, workers=3, chunk_size=10)
+
+        assert report.rows_inserted == 20
+        assert [(error.index, error.offset, error.size) for error in report.errors] == [(2, 20, 10)]
+        assert count_articles(wal_session_factory) == 20
+
+    @pytest.mark.parametrize('executor', ('thread', 'process'))
+    def test_row_factory(self, wal_session_factory, executor):
+        report = parallel_load(
+            ArticleRepository,
+            wal_session_factory,
+            range(40),
+            workers=2,
+            chunk_size=10,
+            row_factory=article_row,
+            executor=executor,
+        )
+
+        assert report.rows_inserted == 30
+        assert [(error.index, str(error.error)) for error in report.errors] == [(1, 'bad row')]
+        assert count_articles(wal_session_factory) == 30
@@ -0,0 +1,105 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from sa_repository import Instrumentation, LRUCache
+
+from .models import Article, Base
+from .repositories import ArticleRepository
+
+
+@pytest.fixture()
+def sessions(tmp_path):
+    engines = [create_engine(f'sqlite:///{tmp_path / name}.db') for name in ('primary', 'replica-1', 'replica-2')]
+    for name, engine in zip(('primary', 'replica-1', 'replica-2'), engines, strict=True):
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            # replication is not simulated, every database gets its own marker row instead
+            session.add(Article(title='marker', group=name))
+            session.commit()
+
+    sessions = [Session(engine) for engine in engines]
+    yield sessions
+    for session in sessions:
+        session.close()
+    for engine in engines:
+        engine.dispose()
+
+
+@pytest.fixture()
+def routed_repository(sessions):
+    primary, *replicas = sessions
+    repository = ArticleRepository(primary)
+    repository.replicas = replicas
+    repository.STICKY_SECONDS = 0
+    return repository
+
+
+def marker_group(repository):
+    return repository.get(Article.title == 'marker').group
+
+
+class TestReadRouting:
+    def test_reads_use_replicas_in_turn(self, routed_repository):
+        assert [marker_group(routed_repository) for _ in range(3)] == ['replica-1', 'replica-2', 'replica-1']
+        assert routed_repository.count() == 1
+        assert routed_repository.get_by_pk(1).group == 'replica-1'
+
+    def test_without_replicas(self, sessions):
+        assert marker_group(ArticleRepository(sessions[0])) == 'primary'
+
+    def test_read_your_writes(self, routed_repository, sessions):
+        routed_repository.create(title='written')
+        assert marker_group(routed_repository) == 'primary'
+        assert routed_repository.get_or_none(Article.title == 'written') is not None
+
+        sessions[0].commit()
+        assert marker_group(routed_repository) == 'replica-1'
+
+    def test_sticky_seconds(self, routed_repository, sessions):
+        routed_repository.STICKY_SECONDS = 60
+        routed_repository.create(title='written')
+        sessions[0].commit()
+
+        assert marker_group(routed_repository) == 'primary'
+
+    def test_route(self, routed_repository):
+        with routed_repository.route('primary'):
+            assert marker_group(routed_repository) == 'primary'
+
+        routed_repository.create(title='written')
+        with routed_repository.route('replica'):
+            assert marker_group(routed_repository) == 'replica-1'
+        assert marker_group(routed_repository) == 'primary'
+
+    def test_get_or_create_uses_primary(self, routed_repository):
+        article, created = routed_repository.get_or_create(title='marker')
+
+        assert not created
+        assert article.group == 'primary'
+
+
+class TestReplicaCacheAndInstrumentation:
+    def test_replica_results_are_not_served_to_primary_reads(self, routed_repository, sessions):
+        cache = LRUCache()
+        routed_repository.CACHE = cache
+        reader = ArticleRepository(sessions[0])
+        reader.replicas = sessions[1:]
+        reader.CACHE = cache
+        routed_repository.create(title='mine')
+        sessions[0].commit()
+        routed_repository.STICKY_SECONDS = 60
+
+        assert reader.get_or_none(Article.title == 'mine') is None
+        assert routed_repository.get_or_none(Article.title == 'mine') is not None
+        with routed_repository.route('primary'):
+            assert routed_repository.get_or_none(Article.title == 'mine') is not None
+
+    def test_instrumentation_records_replica_reads(self, routed_repository, sessions):
+        operations = []
+        routed_repository.INSTRUMENTATION = Instrumentation(sink=operations.append)
+
+        routed_repository.count()
+
+        assert len(operations[0].statements) == 1
+        assert not sessions[0].in_transaction()
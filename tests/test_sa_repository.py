@@ -1,15 +1,18 @@
+import array
 from random import randint
 
 import more_itertools
 import pytest
+import sqlalchemy as sa
 from sqlalchemy import BinaryExpression, exc
+from sqlalchemy.orm import exc as orm_exc
 
-from sa_repository import BaseRepository
+from sa_repository import BaseRepository, Instrumentation
 
 from .conftest import count_queries
 from .factories import ArticleFactory, CategoryFactory, CommentFactory
-from .models import Article, Comment
-from .repositories import ArticleRepository
+from .models import Article, Comment, Note, Post
+from .repositories import ArticleRepository, CommentRepository
 
 
 class TestRepository:
@@ -48,6 +51,50 @@ class TestRepository:
         assert not created
         assert article == obj
 
+    def test_get_or_create_many(self, repository, db_session):
+        existing = ArticleFactory(title='existing', group='many')
+        params = [
+            {'title': 'new #1', 'group': 'many'},
+            {'title': 'existing', 'group': 'many'},
+            {'title': 'new #2'},
+            {'title': 'new #1', 'group': 'many'},
+        ]
+
+        with count_queries(db_session.connection()) as queries:
+            result = repository.get_or_create_many(params)
+
+        assert [created for _, created in result] == [True, False, True, False]
+        assert [obj.title for obj, _ in result] == ['new #1', 'existing', 'new #2', 'new #1']
+        assert result[1][0] is existing
+        assert result[0][0] is result[3][0]
+        assert len([query for query in queries if query.startswith('SELECT')]) == 2
+
+    def test_get_or_create_many__none_values(self, repository):
+        existing = ArticleFactory(title='null group', group=None)
+
+        result = repository.get_or_create_many(
+            [
+                {'title': 'null group', 'group': None},
+                {'title': 'other', 'group': None},
+                {'title': 'null group', 'group': None},
+            ]
+        )
+
+        assert result[0] == (existing, False)
+        assert result[1][1]
+        assert result[2] == (existing, False)
+        assert repository.count(Article.group.is_(None)) == 2
+
+    def test_get_or_create_many__explicit_ids(self, repository):
+        result = repository.get_or_create_many([{'id': 50, 'title': 'fifty'}, {'id': 40, 'title': 'forty'}])
+
+        assert [(obj.id, obj.title, created) for obj, created in result] == [(50, 'fifty', True), (40, 'forty', True)]
+
+    def test_get_or_create_many__multiple_results_error(self, repository):
+        ArticleFactory.create_batch(2, group='group#1')
+        with pytest.raises(exc.MultipleResultsFound):
+            repository.get_or_create_many([{'group': 'group#1'}])
+
     def test_convert_params_to_model_fields(self, repository):
         expected_result: list[BinaryExpression] = [Article.title == 'new title', Article.group == 'group #1']
         result = repository._convert_params_to_model_fields(title='new title', group='group #1')
@@ -60,6 +107,29 @@ class TestRepository:
         with pytest.raises(AttributeError):
             repository._convert_params_to_model_fields(bad_field='new title')
 
+    def test_get_repository_from_model(self, db_session):
+        repository = BaseRepository.get_repository_from_model(db_session, Comment)
+
+        assert isinstance(repository, BaseRepository)
+        assert type(repository).__name__ == 'CommentRepository'
+        assert type(BaseRepository.get_repository_from_model(db_session, Comment)) is type(repository)
+        assert type(BaseRepository.get_repository_from_model(db_session, Article)) is not type(repository)
+
+        comment = CommentFactory()
+        assert repository.get(Comment.id == comment.id) == comment
+
+    def test_model_metadata(self, repository):
+        metadata = repository.model_metadata
+
+        assert metadata is ArticleRepository(repository.session).model_metadata
+        assert set(metadata.columns) == {'id', 'title', 'group'}
+        assert metadata.primary_key_names == ('id',)
+        assert metadata.autoincrement
+        assert metadata.unique_constraints == (('title',),)
+        assert metadata.relationships == {'comments': 'one_to_many', 'categories': 'many_to_many'}
+        assert metadata.tables == {'articles', 'article_to_category'}
+        assert CommentRepository(repository.session).model_metadata.relationships == {'article': 'many_to_one'}
+
 
 @pytest.mark.read
 class TestReadMethods:
@@ -126,6 +196,369 @@ class TestReadMethods:
         result = repository.find(Article.group == 'order', order_by=Article.title.desc())
         assert result[0].title == more_itertools.last(articles).title
 
+    def test_get_by_pk(self, repository, db_session):
+        article = ArticleFactory()
+
+        with count_queries(db_session.connection()) as queries:
+            assert repository.get_by_pk(article.id) is article
+        assert queries == []
+        assert repository.get_by_pk(999999) is None
+
+    def test_get_many_by_pk(self, repository, db_session):
+        cached, *others = ArticleFactory.create_batch(4)
+        for article in others:
+            db_session.expunge(article)
+        repository.BATCH_SIZE = 2
+        pks = [others[2].id, cached.id, others[0].id, 999999, others[1].id, cached.id]
+
+        with count_queries(db_session.connection()) as queries:
+            result = repository.get_many_by_pk(pks)
+
+        assert [item.id for item in result] == [pk for pk in pks if pk != 999999]
+        assert result[1] is cached
+        assert len(queries) == 2
+
+    def test_get_many_by_pk__missing(self, repository):
+        article = ArticleFactory()
+
+        assert repository.get_many_by_pk([999999, article.id], missing='none') == [None, article]
+        with pytest.raises(exc.NoResultFound, match=r'primary keys \[999998, 999999\]'):
+            repository.get_many_by_pk([999998, article.id, 999999], missing='raise')
+
+    def test_get_many_by_pk__expired(self, repository, db_session):
+        article = ArticleFactory(title='before')
+        repository.update_where(Article.id == article.id, synchronize_session=False, title='after')
+        db_session.expire(article)
+
+        assert repository.get_many_by_pk([article.id])[0].title == 'after'
+
+    def test_prefetch(self, repository, db_session):
+        first, second, empty = ArticleFactory.create_batch(3, group='prefetch')
+        CommentFactory.create_batch(2, article=first)
+        CommentFactory(article=second)
+        python, sql = CategoryFactory.create_batch(2)
+        first.categories = [python, sql]
+        second.categories = [sql]
+        db_session.flush()
+        db_session.expunge_all()
+        articles = repository.find(Article.group == 'prefetch', order_by=Article.id)
+
+        with count_queries(db_session.connection()) as queries:
+            result = repository.prefetch(articles, Article.comments, Article.categories)
+            assert [len(article.comments) for article in result] == [2, 1, 0]
+            assert [sorted(category.name for category in article.categories) for article in result] == [
+                sorted([python.name, sql.name]),
+                [sql.name],
+                [],
+            ]
+        assert len(queries) == 2
+        shared = next(category for category in result[0].categories if category.name == sql.name)
+        assert result[1].categories[0] is shared
+
+    def test_prefetch__many_to_one(self, db_session):
+        comments = CommentFactory.create_batch(3)
+        db_session.expunge_all()
+        repository = CommentRepository(db_session)
+        comments = repository.find(order_by=Comment.id)
+
+        with count_queries(db_session.connection()) as queries:
+            repository.prefetch(comments, Comment.article)
+            assert all(comment.article.id == comment.article_id for comment in comments)
+        assert len(queries) == 1
+
+    def test_prefetch__join_condition(self, db_session):
+        first, second = Post(title='first'), Post(title='second')
+        db_session.add_all([first, second])
+        db_session.flush()
+        db_session.add_all(
+            [
+                Note(content='shown', post_id=first.id),
+                Note(content='hidden', post_id=first.id, hidden=True),
+                Note(content='hidden', post_id=second.id, hidden=True),
+            ]
+        )
+        db_session.flush()
+        db_session.expunge_all()
+        repository = BaseRepository.get_repository_from_model(db_session, Post)
+        posts = repository.find(order_by=Post.id)
+
+        repository.prefetch(posts, Post.visible_notes)
+        assert [[note.content for note in post.visible_notes] for post in posts] == [['shown'], []]
+
+    def test_prefetch__keeps_loaded(self, repository, db_session):
+        article = ArticleFactory()
+        CommentFactory(article=article)
+        article.comments = []
+
+        repository.prefetch([article], Article.comments)
+        assert article.comments == []
+
+    def test_prefetch__not_a_relationship(self, repository):
+        with pytest.raises(ValueError, match='is not a relationship of Article'):
+            repository.prefetch([], Article.title)
+        with pytest.raises(ValueError, match='is not a relationship of Article'):
+            repository.prefetch([], Comment.article)
+
+    def test_find_columns(self, repository, db_session):
+        articles = ArticleFactory.create_batch(5, group='columns')
+        articles[1].group = None
+        db_session.flush()
+
+        data = repository.find_columns(
+            Article.title.like('%'),
+            Article.id.in_([article.id for article in articles]),
+            columns=('id', Article.group, sa.func.length(Article.title).label('length')),
+            order_by=Article.id,
+            chunk_size=2,
+            backend='array',
+        )
+
+        assert list(data) == ['id', 'group', 'length']
+        assert data['id'] == array.array('q', [article.id for article in articles])
+        assert data['group'] == ['columns', None, 'columns', 'columns', 'columns']
+        assert list(data['length']) == [len(article.title) for article in articles]
+        assert db_session.identity_map.keys() == {sa.inspect(article).key for article in articles}
+
+    def test_find_columns__numpy(self, repository, db_session):
+        numpy = pytest.importorskip('numpy')
+        articles = ArticleFactory.create_batch(5, group='columns-numpy')
+
+        with count_queries(db_session.connection()) as queries:
+            data = repository.find_columns(
+                Article.group == 'columns-numpy', columns=('id', 'title'), order_by=Article.id, chunk_size=2
+            )
+
+        assert data['id'].dtype == numpy.int64
+        assert data['id'].tolist() == [article.id for article in articles]
+        assert data['title'].tolist() == [article.title for article in articles]
+        assert len([query for query in queries if query.startswith('SELECT count(*)')]) == 1
+
+    def test_find_columns__defaults(self, repository):
+        article = ArticleFactory()
+
+        data = repository.find_columns(Article.id == article.id, backend='list')
+        assert data == {'id': [article.id], 'title': [article.title], 'group': [article.group]}
+        assert repository.find_columns(Article.id == -1, backend='list') == {'id': [], 'title': [], 'group': []}
+
+    def test_find_named(self, repository):
+        articles = ArticleFactory.create_batch(3, group='named')
+        ArticleFactory(group='other')
+
+        assert repository.find_named('by_group', group='named') == articles
+        assert repository.find_named('by_group', group='missing') == []
+        assert repository.find_named('titles') == sorted(repository.find_named('titles'))
+        assert len(repository.find_named('titles')) == 4
+
+    def test_get_named(self, repository):
+        article = ArticleFactory(title='named')
+
+        assert repository.get_named('by_title', title='named') is article
+        with pytest.raises(exc.NoResultFound):
+            repository.get_named('by_title', title='missing')
+        with pytest.raises(KeyError, match="ArticleRepository has no query named 'missing'"):
+            repository.get_named('missing')
+
+    def test_named__duplicated_column_values(self, repository):
+        ArticleFactory.create_batch(2, group='named-twice')
+
+        assert repository.find_named('groups', group='named-twice') == ['named-twice', 'named-twice']
+        with pytest.raises(exc.MultipleResultsFound):
+            repository.get_named('groups', group='named-twice')
+
+    def test_named_query_stats(self, db_session):
+        class NamedRepository(ArticleRepository):
+            pass
+
+        repository = NamedRepository(db_session)
+        repository.find_named('by_group', group='a')
+        repository.find_named('by_group', group='b')
+        NamedRepository(db_session).find_named('by_group', group='c')
+
+        stats = repository.named_query_stats()
+        assert (stats.misses, stats.hits) == (1, 2)
+        assert ArticleRepository(db_session).named_query_stats() is not stats
+
+    def test_find_named__per_model(self, db_session):
+        class GenericRepository(BaseRepository):
+            QUERIES = {'all': lambda repository: repository.get_query()}
+
+        article = ArticleFactory()
+        comment = CommentFactory(article=article)
+
+        assert GenericRepository(db_session, Article).find_named('all') == [article]
+        assert GenericRepository(db_session, Comment).find_named('all') == [comment]
+
+    @pytest.mark.parametrize('page_size', (1, 2, 5, 10))
+    def test_iter_find(self, repository, page_size):
+        articles = ArticleFactory.create_batch(5, group='iter')
+        ArticleFactory(group='other')
+
+        result = list(repository.iter_find(Article.group == 'iter', page_size=page_size))
+        assert [item.id for item in result] == sorted(article.id for article in articles)
+
+    @pytest.mark.parametrize('order_by', (Article.title.desc(), Article.title, Article.id))
+    def test_iter_find__order(self, repository, order_by):
+        ArticleFactory.create_batch(5, group='iter-order')
+
+        result = list(repository.iter_find(Article.group == 'iter-order', order_by=order_by, page_size=2))
+        assert result == list(repository.find(Article.group == 'iter-order', order_by=order_by))
+
+    def test_iter_find__duplicated_order_values(self, repository):
+        articles = ArticleFactory.create_batch(5, group='iter-same')
+
+        result = list(repository.iter_find(Article.group == 'iter-same', order_by=Article.group.desc(), page_size=2))
+        assert [item.id for item in result] == sorted((article.id for article in articles), reverse=True)
+
+    @pytest.mark.parametrize('descending', (False, True))
+    @pytest.mark.parametrize('page_size', (1, 2, 3))
+    def test_iter_find__nullable_order(self, repository, descending, page_size):
+        articles = [ArticleFactory(group=group) for group in (None, 'b', None, 'a', None, 'b', None, 'a', None, 'c')]
+        order_by = Article.group.desc() if descending else Article.group
+
+        result = list(repository.iter_find(order_by=order_by, page_size=page_size))
+
+        expected = sorted(articles, key=lambda item: (item.group is None, item.group or '', item.id))
+        assert result == (expected[::-1] if descending else expected)
+
+    def test_iter_find__pages(self, repository, db_session):
+        ArticleFactory.create_batch(5, group='iter-pages')
+
+        with count_queries(db_session.connection()) as queries:
+            result = list(repository.iter_find(Article.group == 'iter-pages', page_size=2))
+        assert len(result) == 5
+        assert len(queries) == 3
+
+    def test_iter_find__expunge(self, repository, db_session):
+        ArticleFactory.create_batch(3, group='iter-expunge')
+        db_session.expunge_all()
+
+        for article in repository.iter_find(Article.group == 'iter-expunge', page_size=2, expunge=True):
+            assert article in db_session
+        assert len(db_session.identity_map) == 0
+
+    def test_iter_find__joined_loads(self, repository, db_session):
+        articles = ArticleFactory.create_batch(3, group='iter-joined')
+        for article in articles:
+            CommentFactory.create_batch(3, article=article)
+
+        with count_queries(db_session.connection()) as queries:
+            result = list(
+                repository.iter_find(Article.group == 'iter-joined', joined_loads=(Article.comments,), page_size=2)
+            )
+            assert [len(article.comments) for article in result] == [3, 3, 3]
+        assert len(queries) == 2
+
+    def test_iter_find__joins(self, repository):
+        articles = ArticleFactory.create_batch(3, group='iter-joins')
+        for article in articles:
+            CommentFactory.create_batch(3, article=article)
+
+        result = list(repository.iter_find(Article.group == 'iter-joins', joins=[Article.comments], page_size=2))
+        assert [item.id for item in result] == [article.id for article in articles]
+
+    def test_find__select(self, repository, db_session):
+        articles = ArticleFactory.create_batch(3, group='select')
+
+        result = repository.find(Article.group == 'select', select=(Article.id, Article.title), order_by=Article.id)
+
+        assert result == [(article.id, article.title) for article in articles]
+        assert result[0].title == articles[0].title
+
+    def test_find__select_dict(self, repository):
+        article = ArticleFactory(group='select')
+
+        result = repository.find(Article.group == 'select', select=(Article.id, Article.title), row_type=dict)
+        assert result == [{'id': article.id, 'title': article.title}]
+
+    def test_find__select_row_type(self, repository):
+        class ArticleTitle:
+            __slots__ = ('id', 'title')
+
+            def __init__(self, id, title):
+                self.id = id
+                self.title = title
+
+        article = ArticleFactory(group='select')
+
+        result = repository.find(Article.group == 'select', select=(Article.id, Article.title), row_type=ArticleTitle)
+        assert [(item.id, item.title) for item in result] == [(article.id, article.title)]
+
+    def test_find__select_joins(self, repository):
+        comment = CommentFactory(content='projected')
+
+        result = repository.find(
+            Comment.content == 'projected', joins=[Article.comments], select=(Article.title, Comment.content)
+        )
+        assert result == [(comment.article.title, 'projected')]
+
+    def test_find__select_joined_loads(self, repository):
+        with pytest.raises(ValueError, match='joined_loads cannot be used with select'):
+            repository.find(select=(Article.id,), joined_loads=(Article.comments,))
+
+    def test_get__select(self, repository, db_session):
+        article = ArticleFactory()
+        db_session.expunge_all()
+
+        result = repository.get(Article.id == article.id, select=(Article.title,), row_type=dict)
+
+        assert result == {'title': article.title}
+        assert len(db_session.identity_map) == 0
+
+    def test_get_or_none__select(self, repository):
+        article = ArticleFactory()
+
+        assert repository.get_or_none(Article.id == article.id, select=(Article.title,)) == (article.title,)
+        assert repository.get_or_none(Article.id == 999999, select=(Article.title,)) is None
+
+    def test_count(self, repository, db_session):
+        ArticleFactory.create_batch(3, group='count')
+        ArticleFactory(group='other')
+
+        with count_queries(db_session.connection()) as queries:
+            assert repository.count(Article.group == 'count') == 3
+        assert len(queries) == 1
+        assert repository.count(Article.group == 'missing') == 0
+
+    def test_count__joins(self, repository):
+        article = ArticleFactory(group='count')
+        CommentFactory.create_batch(3, article=article)
+        CommentFactory.create_batch(2, article__group='count')
+
+        assert repository.count(Article.group == 'count', joins=[Article.comments]) == 3
+
+    def test_exists(self, repository, db_session):
+        comment = CommentFactory(article__group='exists')
+
+        with count_queries(db_session.connection()) as queries:
+            assert repository.exists(Article.group == 'exists')
+        assert len(queries) == 1
+        assert 'EXISTS' in queries[0]
+        assert not repository.exists(Article.group == 'missing')
+        assert repository.exists(Comment.id == comment.id, joins=[Article.comments])
+
+    def test_aggregate(self, repository):
+        ArticleFactory.create_batch(3, group='aggregate-a')
+        ArticleFactory.create_batch(2, group='aggregate-b')
+
+        result = repository.aggregate(
+            Article.group.like('aggregate-%'),
+            group_by=(Article.group,),
+            order_by=Article.group,
+            total=sa.func.count(Article.id),
+            first_id=sa.func.min(Article.id),
+        )
+
+        assert [(row.group, row.total) for row in result] == [('aggregate-a', 3), ('aggregate-b', 2)]
+        assert all(isinstance(row.first_id, int) for row in result)
+
+    def test_aggregate__no_group_by(self, repository):
+        articles = ArticleFactory.create_batch(3, group='aggregate')
+
+        result = repository.aggregate(
+            Article.group == 'aggregate', row_type=dict, total=sa.func.count(), max_id=sa.func.max(Article.id)
+        )
+        assert result == [{'total': 3, 'max_id': max(article.id for article in articles)}]
+
     def test_m2m__get_relation(self, repository):
         category = CategoryFactory()
         article = ArticleFactory(categories=[category])
@@ -148,6 +581,76 @@ class TestReadMethods:
             assert len(db_article.comments) == len(comments)
         assert len(queries) == 1
 
+    @pytest.mark.parametrize('func', ('get', 'get_or_none', 'find'))
+    @pytest.mark.parametrize('load_strategy', ('selectin', 'subquery', 'auto'))
+    def test_joined_loads__load_strategy(self, repository: ArticleRepository, db_session, func, load_strategy):
+        category = CategoryFactory()
+        article = ArticleFactory(categories=[category])
+        comments = CommentFactory.create_batch(randint(1, 10), article=article)
+        db_session.expunge_all()
+
+        function = getattr(repository, func)
+
+        with count_queries(db_session.connection()) as queries:
+            db_article = function(
+                Article.id == article.id,
+                joined_loads=(Article.comments, Article.categories),
+                load_strategy=load_strategy,
+            )
+            if func == 'find':
+                db_article = more_itertools.first(db_article)
+            assert len(db_article.comments) == len(comments)
+            assert [item.id for item in db_article.categories] == [category.id]
+        assert len(queries) == 3
+        assert 'JOIN' not in queries[0]
+
+    def test_joined_loads__auto(self, db_session):
+        comment = CommentFactory()
+        db_session.expunge_all()
+
+        repository = CommentRepository(db_session)
+        with count_queries(db_session.connection()) as queries:
+            result = repository.get(Comment.id == comment.id, joined_loads=(Comment.article,), load_strategy='auto')
+            assert result.article.id == comment.article_id
+        assert len(queries) == 1
+
+    def test_joined_loads__raise(self, repository, db_session):
+        article = ArticleFactory()
+        db_session.expunge_all()
+
+        result = repository.get(Article.id == article.id, joined_loads=(Article.comments,), load_strategy='raise')
+        with pytest.raises(exc.InvalidRequestError):
+            _ = result.comments
+
+    def test_joined_loads__repository_default(self, repository, db_session, monkeypatch):
+        article = ArticleFactory()
+        CommentFactory.create_batch(2, article=article)
+        db_session.expunge_all()
+        monkeypatch.setattr(repository, 'LOAD_STRATEGY', 'selectin')
+
+        with count_queries(db_session.connection()) as queries:
+            result = repository.get(Article.id == article.id, joined_loads=(Article.comments,))
+            assert len(result.comments) == 2
+        assert len(queries) == 2
+
+    def test_iter_find__selectin(self, repository, db_session):
+        articles = ArticleFactory.create_batch(3, group='iter-selectin')
+        for article in articles:
+            CommentFactory.create_batch(3, article=article)
+        db_session.expunge_all()
+
+        with count_queries(db_session.connection()) as queries:
+            result = list(
+                repository.iter_find(
+                    Article.group == 'iter-selectin',
+                    joined_loads=(Article.comments,),
+                    load_strategy='selectin',
+                    page_size=2,
+                )
+            )
+            assert [len(article.comments) for article in result] == [3, 3, 3]
+        assert len(queries) == 4
+
     @pytest.mark.parametrize('func', ('get', 'get_or_none', 'find'))
     def test_joined_loads__without_joined(self, repository: ArticleRepository, db_session, func):
         article = ArticleFactory()
@@ -181,6 +684,10 @@ class TestWriteMethods:
         with pytest.raises(ValueError, match='Not all models are instance of class Article'):
             repository.create_batch([Article(title='ok'), Comment(content='wrong')])
 
+    def test_unit_of_work__keys_error(self, repository):
+        with pytest.raises(ValueError), repository.unit_of_work():
+            repository.create_batch([Article(title='ok')], returning='keys')
+
     @pytest.mark.parametrize('size', (randint(10, BaseRepository.BATCH_SIZE), BaseRepository.BATCH_SIZE * 2))
     def test_create_batch(self, repository, size):
         repository.create_batch([Article(title=f'title#{i}', group='batch') for i in range(size)])
@@ -203,3 +710,226 @@ class TestWriteMethods:
         db_article = repository.get(Article.id == article.id)
         assert db_article
         assert db_article.categories == [category]
+
+    @pytest.mark.parametrize('size', (randint(10, BaseRepository.BATCH_SIZE), BaseRepository.BATCH_SIZE * 2))
+    def test_create_batch_from_dicts__bulk(self, repository, db_session, size):
+        data = [{'title': f'Article #{i}', 'group': 'bulk-dicts'} for i in range(size)]
+
+        with count_queries(db_session.connection()) as queries:
+            instances = repository.create_batch_from_dicts(data, bulk=True)
+
+        inserts = [query for query in queries if query.startswith('INSERT')]
+        assert len(inserts) == len(list(more_itertools.chunked(data, BaseRepository.BATCH_SIZE)))
+        assert [item.title for item in instances] == [item['title'] for item in data]
+        assert all(item.id is not None for item in instances)
+        assert len(repository.find(Article.group == 'bulk-dicts')) == size
+
+    @pytest.mark.parametrize('returning', ('instances', 'keys'))
+    def test_create_batch_from_dicts__bulk_explicit_ids(self, repository, returning):
+        data = [{'id': 10, 'title': 'ten'}, {'id': 5, 'title': 'five'}, {'title': 'generated'}]
+
+        result = repository.create_batch_from_dicts(data, bulk=True, returning=returning)
+
+        if returning == 'keys':
+            assert result[:2] == [10, 5]
+        else:
+            assert [item.title for item in result] == ['ten', 'five', 'generated']
+            assert [item.id for item in result][:2] == [10, 5]
+
+    def test_create_batch_from_dicts__rollback(self, repository):
+        ArticleFactory(title='duplicated')
+        data = [{'title': 'fresh', 'group': 'rollback'}, {'title': 'duplicated', 'group': 'rollback'}]
+
+        with pytest.raises(exc.IntegrityError):
+            repository.create_batch_from_dicts(data, bulk=True)
+        assert repository.find(Article.group == 'rollback') == []
+
+    def test_create_batch__generator(self, repository, db_session):
+        repository.BATCH_SIZE = 3
+        instances = (Article(title=f'stream #{i}', group='stream') for i in range(7))
+
+        keys = repository.create_batch(instances, expunge=True, returning='keys')
+
+        assert len(keys) == 7
+        assert not db_session.new and not db_session.identity_map
+        assert [item.id for item in repository.find(Article.group == 'stream', order_by=Article.id)] == keys
+
+    def test_create_batch__type_error_in_later_chunk(self, repository):
+        repository.BATCH_SIZE = 2
+        instances = [Article(title='ok #1', group='chunks'), Article(title='ok #2', group='chunks'), Comment()]
+
+        with pytest.raises(ValueError, match='Not all models are instance of class Article'):
+            repository.create_batch(iter(instances))
+        assert repository.find(Article.group == 'chunks') == []
+
+    @pytest.mark.parametrize('bulk', (False, True))
+    def test_create_batch_from_dicts__returning(self, repository, db_session, bulk):
+        repository.BATCH_SIZE = 3
+        data = ({'title': f'stream #{i}', 'group': 'stream'} for i in range(7))
+
+        count = repository.create_batch_from_dicts(data, bulk, expunge=True, returning='count')
+
+        assert count == 7
+        assert not db_session.identity_map
+        assert repository.count(Article.group == 'stream') == 7
+
+    def test_create_batch_from_dicts__keys(self, repository):
+        keys = repository.create_batch_from_dicts(
+            ({'title': f'stream #{i}'} for i in range(3)), bulk=True, returning='keys'
+        )
+        assert [article.id for article in repository.find(order_by=Article.id)] == keys
+
+    def test_unit_of_work(self, repository, db_session):
+        with Instrumentation().operation(db_session, 'unit_of_work') as stats:
+            with repository.unit_of_work():
+                article = repository.create(title='uow #1', group='uow')
+                repository.create_batch([Article(title='uow #2', group='uow')])
+                repository.create_batch_from_dicts([{'title': 'uow #3', 'group': 'uow'}])
+                assert article.id is None
+                assert stats.statements == []
+
+        assert article.id is not None
+        assert stats.savepoints == 1
+        assert len(repository.find(Article.group == 'uow')) == 3
+
+    def test_unit_of_work__flush_threshold(self, repository):
+        with repository.unit_of_work(flush_threshold=2):
+            first = repository.create(title='uow #1')
+            assert first.id is None
+            second = repository.create(title='uow #2')
+            assert first.id is not None and second.id is not None
+
+    def test_unit_of_work__rollback(self, repository):
+        ArticleFactory(title='duplicated')
+
+        with pytest.raises(exc.IntegrityError):
+            with repository.unit_of_work(flush_threshold=1):
+                repository.create(title='fresh', group='uow')
+                repository.create(title='duplicated', group='uow')
+        assert repository.find(Article.group == 'uow') == []
+
+        with pytest.raises(RuntimeError):
+            with repository.unit_of_work():
+                repository.create(title='fresh', group='uow')
+                raise RuntimeError
+        assert repository.find(Article.group == 'uow') == []
+
+    def test_unit_of_work__nested(self, repository):
+        with repository.unit_of_work():
+            with repository.unit_of_work():
+                article = repository.create(title='uow')
+            assert article.id is None
+        assert article.id is not None
+
+    def test_insert_batch_from_dicts(self, repository):
+        data = [{'title': f'Article #{i}', 'group': 'insert-keys'} for i in range(10)]
+        keys = repository.insert_batch_from_dicts(data)
+
+        assert len(keys) == 10
+        result = repository.find(Article.id.in_(keys), order_by=Article.id)
+        assert [item.id for item in result] == keys
+        assert [item.title for item in result] == [item['title'] for item in data]
+
+    def test_insert_batch_from_dicts__empty(self, repository):
+        assert repository.insert_batch_from_dicts([]) == []
+
+    @pytest.mark.parametrize('native', (True, False))
+    def test_upsert_batch(self, repository, db_session, monkeypatch, native):
+        if not native:
+            monkeypatch.setattr(repository, '_get_upsert_insert', lambda: None)
+        existing = ArticleFactory(title='existing', group='old')
+        rows = [{'title': 'existing', 'group': 'upsert'}, {'title': 'new', 'group': 'upsert'}]
+
+        keys = repository.upsert_batch(rows, conflict_columns=['title'])
+
+        assert len(keys) == 2
+        assert existing.id in keys
+        db_session.expire_all()
+        result = repository.find(Article.group == 'upsert', order_by=Article.title)
+        assert [(item.title, item.group) for item in result] == [('existing', 'upsert'), ('new', 'upsert')]
+
+    @pytest.mark.parametrize('native', (True, False))
+    def test_upsert_batch__do_nothing(self, repository, db_session, monkeypatch, native):
+        if not native:
+            monkeypatch.setattr(repository, '_get_upsert_insert', lambda: None)
+        ArticleFactory(title='existing', group='old')
+
+        keys = repository.upsert_batch(
+            [{'title': 'existing', 'group': 'upsert'}], conflict_columns=['title'], update_columns=[]
+        )
+
+        assert keys == []
+        db_session.expire_all()
+        assert repository.get(Article.title == 'existing').group == 'old'
+
+    @pytest.mark.parametrize('native', (True, False))
+    def test_upsert_batch__keeps_primary_key(self, repository, db_session, monkeypatch, native):
+        if not native:
+            monkeypatch.setattr(repository, '_get_upsert_insert', lambda: None)
+        existing = ArticleFactory(title='existing', group='old')
+
+        keys = repository.upsert_batch(
+            [{'id': existing.id + 1000, 'title': 'existing', 'group': 'upsert'}], conflict_columns=['title']
+        )
+
+        assert keys == [existing.id]
+        db_session.expire_all()
+        assert repository.get(Article.title == 'existing').id == existing.id
+        with pytest.raises(ValueError, match='primary key'):
+            repository.upsert_batch([{'id': 1, 'title': 'existing'}], conflict_columns=['title'], update_columns=['id'])
+
+    def test_upsert_batch__empty(self, repository):
+        assert repository.upsert_batch([], conflict_columns=['title']) == []
+
+    def test_update_where(self, repository, db_session):
+        articles = ArticleFactory.create_batch(3, group='to-update')
+        other = ArticleFactory(group='other')
+
+        with count_queries(db_session.connection()) as queries:
+            count = repository.update_where(Article.group == 'to-update', group='updated')
+
+        assert count == 3
+        assert len(queries) == 1
+        assert all(article.group == 'updated' for article in articles)
+        assert other.group == 'other'
+
+    def test_update_where__no_synchronization(self, repository, db_session):
+        article = ArticleFactory(group='to-update')
+
+        repository.update_where(Article.id == article.id, synchronize_session=False, group='updated')
+        assert article.group == 'to-update'
+
+        db_session.refresh(article)
+        assert article.group == 'updated'
+
+    def test_delete_where(self, repository, db_session):
+        articles = ArticleFactory.create_batch(3, group='to-delete')
+        ArticleFactory(group='other')
+
+        count = repository.delete_where(Article.group == 'to-delete')
+
+        assert count == 3
+        assert repository.find(Article.group == 'to-delete') == []
+        assert all(article not in db_session for article in articles)
+        assert len(repository.find(Article.group == 'other')) == 1
+
+    @pytest.mark.parametrize('size', (randint(10, BaseRepository.BATCH_SIZE), BaseRepository.BATCH_SIZE * 2))
+    def test_update_batch_from_dicts(self, repository, db_session, size):
+        keys = repository.insert_batch_from_dicts([{'title': f'Article #{i}'} for i in range(size)])
+
+        with count_queries(db_session.connection()) as queries:
+            count = repository.update_batch_from_dicts([{'id': key, 'group': f'group #{key}'} for key in keys])
+
+        assert count == size
+        assert len([query for query in queries if query.startswith('UPDATE')]) == len(
+            list(more_itertools.chunked(keys, BaseRepository.BATCH_SIZE))
+        )
+        result = repository.find(Article.id.in_(keys))
+        assert all(article.group == f'group #{article.id}' for article in result)
+
+    def test_update_batch_from_dicts__missing_key(self, repository):
+        article = ArticleFactory(group='old')
+
+        with pytest.raises(orm_exc.StaleDataError):
+            repository.update_batch_from_dicts([{'id': article.id, 'group': 'new'}, {'id': 999999, 'group': 'new'}])
+        assert repository.get(Article.id == article.id).group == 'old'
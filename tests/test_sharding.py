@@ -0,0 +1,140 @@
+import threading
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import create_engine, exc
+from sqlalchemy.orm import Session
+
+from sa_repository import ShardedRepository
+
+from .models import Article, Base
+from .repositories import ArticleRepository
+
+SHARDS = ('eu', 'us', 'asia')
+SHARD_OF_GROUP = {'de': 'eu', 'fr': 'eu', 'ca': 'us', 'jp': 'asia'}
+
+
+@pytest.fixture()
+def sessions(tmp_path):
+    engines = {
+        name: create_engine(f'sqlite:///{tmp_path / name}.db', connect_args={'check_same_thread': False})
+        for name in SHARDS
+    }
+    for engine in engines.values():
+        Base.metadata.create_all(engine)
+
+    sessions = {name: Session(engine) for name, engine in engines.items()}
+    yield sessions
+    for session in sessions.values():
+        session.close()
+    for engine in engines.values():
+        engine.dispose()
+
+
+@pytest.fixture()
+def sharded(sessions):
+    shards = {name: ArticleRepository(session) for name, session in sessions.items()}
+    with ShardedRepository(shards, 'group', SHARD_OF_GROUP.__getitem__) as repository:
+        yield repository
+
+
+@pytest.fixture()
+def articles(sharded):
+    return sharded.create_batch(
+        [Article(title=f'{group} #{i}', group=group) for i in range(3) for group in ('de', 'ca', 'jp', 'fr')]
+    )
+
+
+def shard_titles(sessions, name):
+    return sorted(sessions[name].scalars(sa.select(Article.title)))
+
+
+class TestWrites:
+    def test_create(self, sharded, sessions):
+        article = sharded.create(title='created', group='jp')
+
+        assert sa.inspect(article).session is sessions['asia']
+        assert shard_titles(sessions, 'asia') == ['created']
+        with pytest.raises(ValueError, match="no value for shard key 'group'"):
+            sharded.create(title='no group')
+
+    def test_create_batch(self, sharded, sessions, articles):
+        assert [article.title for article in articles][:4] == ['de #0', 'ca #0', 'jp #0', 'fr #0']
+        assert shard_titles(sessions, 'eu') == ['de #0', 'de #1', 'de #2', 'fr #0', 'fr #1', 'fr #2']
+        assert shard_titles(sessions, 'us') == ['ca #0', 'ca #1', 'ca #2']
+
+        keys = sharded.create_batch(
+            [Article(title='key #1', group='ca'), Article(title='key #2', group='de')], returning='keys'
+        )
+        assert keys == [4, 7]
+        assert sharded.create_batch([Article(title='counted', group='jp')], returning='count') == 1
+
+    def test_default_shard_for(self, sessions):
+        shards = {name: ArticleRepository(session) for name, session in sessions.items()}
+        with ShardedRepository(shards, 'group') as sharded:
+            assert {sharded.shard_of('de') for _ in range(3)} == {sharded.shard_of('de')}
+            assert {sharded.shard_of(str(i)) for i in range(30)} == set(SHARDS)
+
+
+@pytest.mark.usefixtures('articles')
+class TestReads:
+    def test_get__single_shard(self, sharded, sessions):
+        for session in sessions.values():
+            session.expunge_all()
+        queried = []
+        for name, session in sessions.items():
+            sa.event.listen(session, 'do_orm_execute', lambda state, name=name: queried.append(name))
+
+        assert sharded.get(Article.group == 'jp', Article.title == 'jp #1').title == 'jp #1'
+        assert sharded.get_or_none(Article.group.in_(['de', 'fr']), Article.title == 'jp #1') is None
+        assert sharded.count(sa.and_(Article.group == 'ca', Article.id > 0)) == 3
+        assert queried == ['asia', 'eu', 'us']
+
+    def test_get__fan_out(self, sharded):
+        assert sharded.get(Article.title == 'fr #2').group == 'fr'
+        with pytest.raises(exc.NoResultFound):
+            sharded.get(Article.title == 'missing')
+        with pytest.raises(exc.MultipleResultsFound):
+            sharded.get(Article.id == 1)
+
+    def test_find__fan_out_is_concurrent(self, sharded, sessions):
+        threads = set()
+        for session in sessions.values():
+            sa.event.listen(session, 'do_orm_execute', lambda state: threads.add(threading.current_thread().name))
+
+        assert len(sharded.find()) == 12
+        assert sharded.count() == 12
+        assert sharded.exists(Article.title == 'ca #1')
+        assert all(name.startswith('shard') for name in threads)
+
+    def test_find__order_by(self, sharded, articles):
+        result = sharded.find(Article.title.like('%#%'), order_by=Article.title.desc())
+
+        assert [article.title for article in result] == sorted((article.title for article in articles), reverse=True)
+        assert [article.title for article in sharded.find(order_by=Article.title)][:3] == ['ca #0', 'ca #1', 'ca #2']
+
+    def test_find__order_by_select(self, sharded):
+        result = sharded.find(
+            Article.title.like('%#1'), order_by=Article.title, select=(Article.title, Article.group), row_type=dict
+        )
+
+        assert result == [
+            {'title': 'ca #1', 'group': 'ca'},
+            {'title': 'de #1', 'group': 'de'},
+            {'title': 'fr #1', 'group': 'fr'},
+            {'title': 'jp #1', 'group': 'jp'},
+        ]
+
+    @pytest.mark.parametrize('descending', (False, True))
+    def test_find__order_by_nulls(self, sharded, sessions, articles, descending):
+        for name, session in sessions.items():
+            session.add(Article(title=f'{name} without group'))
+        sessions['eu'].add(Article(title='without group #2'))
+        order_by = Article.group.desc() if descending else Article.group
+
+        result = sharded.find(order_by=order_by)
+
+        groups = [article.group for article in result]
+        # SQLite sorts NULLs before all values
+        expected = [None] * 4 + sorted(article.group for article in articles)
+        assert groups == (expected[::-1] if descending else expected)